@@ -0,0 +1,22 @@
+from django.urls import path
+
+from . import views
+
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', views.PostListView.as_view(), name='posts'),
+    path('posts/<int:post_id>/', views.PostDetailView.as_view(),
+         name='post'),
+    path('posts/<int:post_id>/comments/', views.CommentListView.as_view(),
+         name='post_comments'),
+    path('categories/', views.CategoryListView.as_view(), name='categories'),
+    path('categories/<slug:category_slug>/',
+         views.CategoryDetailView.as_view(), name='category'),
+    path('locations/', views.LocationListView.as_view(), name='locations'),
+    path('locations/<int:location_id>/', views.LocationDetailView.as_view(),
+         name='location'),
+    path('authors/<slug:username>/', views.AuthorDetailView.as_view(),
+         name='author'),
+]
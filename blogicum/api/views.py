@@ -0,0 +1,253 @@
+from django.conf import settings
+from django.core.exceptions import BadRequest
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
+from django.views import View
+
+from blog.cache import FEED_SCOPE, SITE_SCOPE, author_scope, post_scope
+from blog.models import Category, Comments, Location, User, get_filtered_posts
+from blog.paginators import CursorPaginator, InvalidCursor
+from blog.views import ConditionalGetMixin
+
+
+class Field:
+    """A field of an API resource and the columns it needs loaded.
+
+    ``related`` is followed with select_related() and ``get`` turns the
+    object into the value, the attribute of the same name by default.
+    """
+
+    def __init__(self, *columns, related=None, get=None):
+        self.columns = columns
+        self.related = related
+        self.get = get
+
+    def serialize(self, obj, name):
+        return self.get(obj) if self.get else getattr(obj, name)
+
+
+POST_FIELDS = {
+    'id': Field('id'),
+    'title': Field('title'),
+    'text': Field('text'),
+    'pub_date': Field('pub_date'),
+    'updated_at': Field('updated_at'),
+    'image': Field(
+        'image', get=lambda post: post.image.url if post.image else None
+    ),
+    'comment_count': Field('comment_count'),
+    'author': Field(
+        'author__username', related='author',
+        get=lambda post: post.author.username,
+    ),
+    'category': Field(
+        'category__slug', related='category',
+        get=lambda post: post.category.slug,
+    ),
+    'location': Field(
+        'location__name', 'location__is_published', related='location',
+        get=lambda post: (
+            post.location.name
+            if post.location and post.location.is_published else None
+        ),
+    ),
+}
+COMMENT_FIELDS = {
+    'id': Field('id'),
+    'text': Field('text'),
+    'created_at': Field('created_at'),
+    'author': Field(
+        'author__username', related='author',
+        get=lambda comment: comment.author.username,
+    ),
+}
+CATEGORY_FIELDS = {
+    'slug': Field('slug'),
+    'title': Field('title'),
+    'description': Field('description'),
+}
+LOCATION_FIELDS = {
+    'id': Field('id'),
+    'name': Field('name'),
+}
+AUTHOR_FIELDS = {
+    'username': Field('username'),
+    'first_name': Field('first_name'),
+    'last_name': Field('last_name'),
+    'date_joined': Field('date_joined'),
+}
+
+
+class ResourceMixin(ConditionalGetMixin):
+    """Serve a resource as JSON with only the fields asked for.
+
+    ``?fields=a,b`` limits the output and, through only() and
+    select_related(), the columns and joins of the query.
+    """
+
+    http_method_names = ('get', 'head', 'options')
+    fields = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except BadRequest as error:
+            return JsonResponse({'detail': str(error)}, status=400)
+        except Http404:
+            return JsonResponse({'detail': 'Не найдено.'}, status=404)
+
+    def get_field_names(self):
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.fields)
+        names = [name.strip() for name in requested.split(',')]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise BadRequest(f'Неизвестные поля: {", ".join(unknown)}.')
+        return names
+
+    def select(self, queryset, names, columns=()):
+        fields = [self.fields[name] for name in names]
+        related = {field.related for field in fields if field.related}
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only('pk', *columns, *(
+            column for field in fields for column in field.columns
+        ))
+
+    def serialize(self, obj, names):
+        return {name: self.fields[name].serialize(obj, name) for name in names}
+
+
+class ResourceListView(ResourceMixin, View):
+    def get_page_url(self, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query['cursor'] = cursor
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{query.urlencode()}'
+        )
+
+    def get(self, request, *args, **kwargs):
+        names = self.get_field_names()
+        queryset = self.get_queryset()
+        paginator = CursorPaginator(queryset, settings.API_PAGE_SIZE)
+        paginator.queryset = self.select(
+            queryset, names, [name for name, _ in paginator.ordering]
+        )
+        try:
+            page = paginator.page(request.GET.get('cursor'))
+        except InvalidCursor as error:
+            raise BadRequest(str(error))
+        return JsonResponse({
+            'results': [self.serialize(obj, names) for obj in page],
+            'next': self.get_page_url(page.next_cursor),
+            'previous': self.get_page_url(page.previous_cursor),
+        })
+
+
+class ResourceDetailView(ResourceMixin, View):
+    lookup_field = 'pk'
+    lookup_url_kwarg = None
+
+    def get(self, request, *args, **kwargs):
+        names = self.get_field_names()
+        obj = get_object_or_404(
+            self.select(self.get_queryset(), names),
+            **{self.lookup_field: kwargs[self.lookup_url_kwarg]}
+        )
+        return JsonResponse(self.serialize(obj, names))
+
+
+class PostListView(ResourceListView):
+    fields = POST_FIELDS
+    cache_scopes = (FEED_SCOPE,)
+
+    def get_queryset(self):
+        posts = get_filtered_posts()
+        if 'category' in self.request.GET:
+            posts = posts.filter(category__slug=self.request.GET['category'])
+        if 'author' in self.request.GET:
+            posts = posts.filter(author__username=self.request.GET['author'])
+        return posts
+
+    def get_modified(self):
+        return self.get_queryset().values_list('pub_date', flat=True).first()
+
+
+class PostScopeMixin:
+    def get_cache_scopes(self):
+        return (post_scope(self.kwargs['post_id']), SITE_SCOPE)
+
+    @cached_property
+    def post_updated_at(self):
+        """When the post was changed, or None if it is missing or hidden."""
+        return get_filtered_posts(selected_related=False).filter(
+            pk=self.kwargs['post_id']
+        ).values_list('updated_at', flat=True).first()
+
+    def get_modified(self):
+        return self.post_updated_at
+
+
+class PostDetailView(PostScopeMixin, ResourceDetailView):
+    fields = POST_FIELDS
+    lookup_url_kwarg = 'post_id'
+
+    def get_queryset(self):
+        return get_filtered_posts()
+
+
+class CommentListView(PostScopeMixin, ResourceListView):
+    fields = COMMENT_FIELDS
+
+    def get_queryset(self):
+        if self.post_updated_at is None:
+            raise Http404
+        return Comments.objects.filter(post_id=self.kwargs['post_id'])
+
+
+class CategoryMixin:
+    fields = CATEGORY_FIELDS
+
+    def get_queryset(self):
+        return Category.objects.filter(is_published=True)
+
+
+class CategoryListView(CategoryMixin, ResourceListView):
+    pass
+
+
+class CategoryDetailView(CategoryMixin, ResourceDetailView):
+    lookup_field = 'slug'
+    lookup_url_kwarg = 'category_slug'
+
+
+class LocationMixin:
+    fields = LOCATION_FIELDS
+
+    def get_queryset(self):
+        return Location.objects.filter(is_published=True)
+
+
+class LocationListView(LocationMixin, ResourceListView):
+    pass
+
+
+class LocationDetailView(LocationMixin, ResourceDetailView):
+    lookup_url_kwarg = 'location_id'
+
+
+class AuthorDetailView(ResourceDetailView):
+    fields = AUTHOR_FIELDS
+    lookup_field = 'username'
+    lookup_url_kwarg = 'username'
+
+    def get_cache_scopes(self):
+        return (author_scope(self.kwargs['username']), SITE_SCOPE)
+
+    def get_queryset(self):
+        return User.objects.all()
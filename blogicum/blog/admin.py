@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Category, Location, Post, Comments
+from .models import Category, Comments, Job, Location, Post
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -92,8 +92,24 @@ class CommentsAdmin(admin.ModelAdmin):
     short_comment.short_description = 'Коментарий'
 
 
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'task',
+        'status',
+        'attempts',
+        'run_after',
+        'created_at',
+    )
+    list_filter = (
+        'task',
+        'status',
+    )
+    readonly_fields = ('error',)
+
+
 admin.site.empty_value_display = 'Не задано'
 admin.site.register(Post, PostAdmin)
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Comments, CommentsAdmin)
+admin.site.register(Job, JobAdmin)
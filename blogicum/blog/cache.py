@@ -0,0 +1,101 @@
+import hashlib
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+VERSION_KEY = 'blog:version:{}'
+PAGE_KEY = 'blog:page:{}:{}'
+SITE_SCOPE = 'site'
+FEED_SCOPE = 'feed'
+SYNDICATION_SCOPE = 'syndication'
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def category_scope(slug):
+    return f'category:{slug}'
+
+
+def author_scope(username):
+    return f'author:{username}'
+
+
+def syndication_scope(scope):
+    return f'syndication:{scope}'
+
+
+def sitemap_scope(section, object_id):
+    """Scope of the sitemap section listing the object with this id."""
+    number = (object_id - 1) // settings.SITEMAP_SECTION_SIZE + 1
+    return f'sitemap:{section}:{number}'
+
+
+def get_versions(*scopes):
+    keys = [VERSION_KEY.format(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = {key: time.time() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*scopes):
+    now = time.time()
+    cache.set_many(
+        {VERSION_KEY.format(scope): now for scope in scopes}, None
+    )
+
+
+def is_page_cacheable(request):
+    return (
+        settings.ANONYMOUS_PAGE_CACHE_TIMEOUT
+        and request.method == 'GET'
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and not request.user.is_authenticated
+    )
+
+
+def get_page_cache_key(request, scopes):
+    return PAGE_KEY.format(
+        hashlib.md5(request.get_full_path().encode()).hexdigest(),
+        ':'.join(str(version) for version in get_versions(*scopes)),
+    )
+
+
+def cache_page_response(request, key, response):
+    if (
+        response.status_code == 200
+        and not response.cookies
+        and not request.META.get('CSRF_COOKIE_USED')
+    ):
+        cache.set(key, response, settings.ANONYMOUS_PAGE_CACHE_TIMEOUT)
+
+
+def get_validators(request, scopes, modified=None):
+    """Return the ETag and Last-Modified of a page.
+
+    Pages of a signed in user hold forms with the CSRF token, which is
+    rotated on login along with the session key, so the ETag includes it.
+    """
+    versions = get_versions(*scopes)
+    session_key = (
+        request.session.session_key if request.user.is_authenticated
+        else None
+    )
+    etag = hashlib.md5(':'.join(
+        str(part) for part in (
+            request.get_full_path(), request.user.pk, session_key, modified,
+            *versions,
+        )
+    ).encode()).hexdigest()
+    last_modified = datetime.fromtimestamp(max(versions), tz=timezone.utc)
+    if modified is not None:
+        last_modified = max(last_modified, modified)
+    return etag, last_modified
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+LOCAL_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+DUMMY_CACHE = 'django.core.cache.backends.dummy.DummyCache'
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    if settings.DEBUG:
+        return []
+    backend = settings.CACHES['default']['BACKEND']
+    if backend == LOCAL_CACHE:
+        return [Error(
+            'The default cache is not shared between processes.',
+            hint='Cache versions, pages and sessions must be seen by every '
+                 'worker: configure memcached or the file cache in CACHES.',
+            id='blog.E001',
+        )]
+    if backend == DUMMY_CACHE:
+        return [Warning(
+            'The default cache does not store anything.',
+            hint='Pages, feeds and sessions are built anew on every request '
+                 'and clients never get 304 responses.',
+            id='blog.W001',
+        )]
+    return []
@@ -0,0 +1,87 @@
+import csv
+import json
+from datetime import date, datetime
+
+from .models import Category, Comments, Location, Post, User
+
+
+# Exported tables in dependency order: the model, its columns and the
+# timestamp selecting rows for an incremental export. Users have no
+# modification time, so only authors who joined since are exported and
+# later profile edits are not. Deleted rows leave nothing to export.
+TABLES = {
+    'authors': (
+        User, ('id', 'username', 'first_name', 'last_name', 'date_joined'),
+        'date_joined',
+    ),
+    'categories': (
+        Category,
+        ('id', 'title', 'description', 'slug', 'is_published', 'created_at',
+         'updated_at'),
+        'updated_at',
+    ),
+    'locations': (
+        Location,
+        ('id', 'name', 'is_published', 'created_at', 'updated_at'),
+        'updated_at',
+    ),
+    'posts': (
+        Post,
+        ('id', 'title', 'text', 'pub_date', 'author_id', 'location_id',
+         'category_id', 'image', 'is_published', 'created_at', 'updated_at'),
+        'updated_at',
+    ),
+    'comments': (
+        Comments,
+        ('id', 'text', 'post_id', 'author_id', 'created_at', 'updated_at'),
+        'updated_at',
+    ),
+}
+FORMATS = ('jsonl', 'csv')
+
+
+def serialize(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def write_jsonl(stream, columns, rows):
+    count = 0
+    for count, row in enumerate(rows, 1):
+        stream.write(json.dumps(
+            dict(zip(columns, map(serialize, row))), ensure_ascii=False
+        ))
+        stream.write('\n')
+    return count
+
+
+def write_csv(stream, columns, rows):
+    writer = csv.writer(stream)
+    writer.writerow(columns)
+    count = 0
+    for count, row in enumerate(rows, 1):
+        writer.writerow(map(serialize, row))
+    return count
+
+
+WRITERS = {'jsonl': write_jsonl, 'csv': write_csv}
+
+
+def deserialize(field, value):
+    if value == '' and field.null:
+        return None
+    return field.to_python(value)
+
+
+def read_jsonl(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_csv(stream):
+    return csv.DictReader(stream)
+
+
+READERS = {'jsonl': read_jsonl, 'csv': read_csv}
@@ -0,0 +1,159 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date
+from django.utils.text import Truncator
+from django.views.decorators.http import condition
+
+from .cache import (
+    SITE_SCOPE, SYNDICATION_SCOPE, author_scope, category_scope,
+    get_validators, get_versions, syndication_scope)
+from .models import Category, Post, User, get_filtered_posts
+
+
+SYNDICATION_KEY = 'blog:syndication:{}'
+
+
+class PostsFeed(Feed):
+    """RSS feed of the latest published posts.
+
+    The rendered feed is cached until a post in it changes, and readers
+    polling with ETag or Last-Modified get a 304 for a single query.
+    """
+
+    title = 'Блогикум'
+    description = 'Новые публикации'
+    link = reverse_lazy('blog:index')
+
+    def __call__(self, request, *args, **kwargs):
+        scopes = self.get_cache_scopes(**kwargs)
+        latest = self.get_posts(**kwargs).values_list(
+            'pub_date', flat=True
+        ).first()
+        etag, last_modified = get_validators(request, scopes, latest)
+
+        @condition(
+            etag_func=lambda request: etag,
+            last_modified_func=lambda request: last_modified,
+        )
+        def respond(request):
+            # The feed does not depend on the user or the query string.
+            key = SYNDICATION_KEY.format(hashlib.md5(':'.join(
+                str(part) for part in (
+                    type(self).__name__, request.get_host(),
+                    *kwargs.values(), latest, *get_versions(*scopes),
+                )
+            ).encode()).hexdigest())
+            response = cache.get(key)
+            if response is None:
+                response = super(PostsFeed, self).__call__(
+                    request, *args, **kwargs
+                )
+                cache.set(key, response, settings.SYNDICATION_CACHE_TIMEOUT)
+            # Feed sets the date of the newest item, which is older than
+            # the validator after a site change.
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+            return response
+
+        return respond(request)
+
+    def get_cache_scopes(self):
+        return (SYNDICATION_SCOPE, SITE_SCOPE)
+
+    def get_posts(self):
+        return get_filtered_posts()
+
+    def items(self):
+        return self.get_posts()[:settings.SYNDICATION_ITEMS]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return Truncator(post.text).words(60)
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', args=[post.pk])
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_categories(self, post):
+        return (post.category.title,)
+
+
+class CategoryFeed(PostsFeed):
+    def get_cache_scopes(self, category_slug):
+        return (
+            syndication_scope(category_scope(category_slug)), SITE_SCOPE
+        )
+
+    def get_posts(self, category_slug):
+        return get_filtered_posts(
+            posts=Post.objects.filter(category__slug=category_slug)
+        )
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=[category.slug])
+
+    def items(self, category):
+        return self.get_posts(category.slug)[:settings.SYNDICATION_ITEMS]
+
+
+class AuthorFeed(PostsFeed):
+    def get_cache_scopes(self, username):
+        return (syndication_scope(author_scope(username)), SITE_SCOPE)
+
+    def get_posts(self, username):
+        return get_filtered_posts(
+            posts=Post.objects.filter(author__username=username)
+        )
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f'Блогикум: {author.get_full_name() or author.username}'
+
+    def description(self, author):
+        return f'Публикации пользователя {author.username}'
+
+    def link(self, author):
+        return reverse('blog:profile', args=[author.username])
+
+    def items(self, author):
+        return self.get_posts(author.username)[:settings.SYNDICATION_ITEMS]
+
+
+class AtomPostsFeed(PostsFeed):
+    feed_type = Atom1Feed
+
+
+class AtomCategoryFeed(CategoryFeed):
+    feed_type = Atom1Feed
+
+
+class AtomAuthorFeed(AuthorFeed):
+    feed_type = Atom1Feed
@@ -16,11 +16,25 @@ class PostForm(forms.ModelForm):
             })
         }
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, upload=None, **kwargs):
         super(PostForm, self).__init__(*args, **kwargs)
+        self.upload = upload
         if not self.instance.pk:
             self.fields['pub_date'].initial = timezone.now()
 
+    def clean_image(self):
+        image = self.cleaned_data['image']
+        if image is False:
+            self.instance.image_hash = ''
+        if self.upload is None:
+            return image
+        if 'image' in self.upload.errors:
+            raise forms.ValidationError(self.upload.errors['image'])
+        self.instance.image_hash = self.upload.hashes.get(
+            'image', self.instance.image_hash
+        )
+        return image
+
 
 class CommentsForm(forms.ModelForm):
 
@@ -0,0 +1,145 @@
+import hashlib
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, JpegImagePlugin
+
+
+RENDITIONS_DIR = 'posts_images/renditions'
+FORMATS = {'jpeg': 'jpg', 'png': 'png', 'webp': 'webp'}
+# Image.info keys of metadata that may identify the author or the place a
+# photo was taken at.
+METADATA_KEYS = {'exif', 'xmp', 'XML:com.adobe.xmp', 'photoshop', 'comment'}
+
+
+def get_rendition_name(digest, width, image_format):
+    return posixpath.join(
+        RENDITIONS_DIR, digest[:2],
+        f'{digest}_{width}w.{FORMATS[image_format]}'
+    )
+
+
+def save_rendition(rendition, digest, width, image_format):
+    name = get_rendition_name(digest, width, image_format)
+    if default_storage.exists(name):
+        return name
+    output = BytesIO()
+    rendition.save(
+        output, image_format.upper(),
+        quality=settings.POST_IMAGE_QUALITY, optimize=True
+    )
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(output.getvalue()))
+    return name
+
+
+def get_rendition_widths(width):
+    return sorted({
+        min(rendition * density, width)
+        for rendition in settings.POST_IMAGE_RENDITIONS.values()
+        for density in settings.POST_IMAGE_DENSITIES
+    }, reverse=True)
+
+
+def resize(picture, widths):
+    """Scale the picture to each width, largest first.
+
+    Every size is derived from the previous one, so the full-resolution
+    original is converted and resampled only once.
+    """
+    resized = {}
+    for width in widths:
+        picture = picture.copy()
+        picture.thumbnail((width, picture.height), Image.Resampling.LANCZOS)
+        resized[width] = picture
+    return resized
+
+
+def strip_metadata(content):
+    """Return the image saved again without metadata, or None if it has none.
+
+    The EXIF orientation is applied to the pixels, and a JPEG keeps its
+    quantization tables and subsampling so that it loses as little
+    quality as possible. Animated images are left as they are.
+    """
+    with Image.open(BytesIO(content)) as picture:
+        if getattr(picture, 'is_animated', False) or not (
+            METADATA_KEYS & set(picture.info) or getattr(picture, 'text', None)
+        ):
+            return None
+        options = {
+            key: picture.info[key]
+            for key in ('icc_profile', 'transparency', 'dpi')
+            if key in picture.info
+        }
+        if picture.format == 'JPEG':
+            options['qtables'] = picture.quantization
+            options['subsampling'] = JpegImagePlugin.get_sampling(picture)
+        elif picture.format == 'WEBP':
+            options['quality'] = settings.POST_IMAGE_QUALITY
+        stripped = ImageOps.exif_transpose(picture)
+        stripped.info = {}
+        output = BytesIO()
+        stripped.save(output, picture.format, **options)
+    return output.getvalue()
+
+
+def render_renditions(image):
+    """Render every rendition kind of an uploaded image.
+
+    Returns the SHA-256 of the upload and a mapping of kind to the
+    rendered sizes and file names, with None values when the upload
+    cannot be decoded. Renditions are saved without EXIF metadata under
+    names derived from the source content, so identical uploads share
+    their files.
+    """
+    with image.storage.open(image.name) as source:
+        content = source.read()
+    digest = hashlib.sha256(content).hexdigest()
+    try:
+        with Image.open(BytesIO(content)) as picture:
+            has_alpha = 'A' in picture.getbands() or (
+                'transparency' in picture.info
+            )
+            largest = get_rendition_widths(max(picture.size))[0]
+            picture.draft('RGB', (largest, largest))
+            picture = ImageOps.exif_transpose(picture).convert(
+                'RGBA' if has_alpha else 'RGB'
+            )
+            fallback = 'png' if has_alpha else 'jpeg'
+            resized = resize(picture, get_rendition_widths(picture.width))
+            renditions = {}
+            for kind, width in settings.POST_IMAGE_RENDITIONS.items():
+                widths = sorted({
+                    min(width * density, picture.width)
+                    for density in settings.POST_IMAGE_DENSITIES
+                })
+                renditions[kind] = {
+                    'width': widths[0],
+                    'height': resized[widths[0]].height,
+                    'widths': widths,
+                    'fallback': fallback,
+                    'sources': {
+                        image_format: [
+                            save_rendition(
+                                resized[rendition], digest, rendition,
+                                image_format
+                            )
+                            for rendition in widths
+                        ]
+                        for image_format in ('webp', fallback)
+                    },
+                }
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return digest, dict.fromkeys(settings.POST_IMAGE_RENDITIONS)
+    return digest, renditions
+
+
+def get_srcset(names, widths):
+    return ', '.join(
+        f'{default_storage.url(name)} {width}w'
+        for name, width in zip(names, widths)
+    )
@@ -0,0 +1,86 @@
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+
+TASKS = {}
+
+
+def task(func):
+    TASKS[func.__name__] = func
+    return func
+
+
+def enqueue(task_name, **payload):
+    return Job.objects.create(task=task_name, payload=payload)
+
+
+def enqueue_once(task_name, delay=0, **payload):
+    """Queue a job in `delay` seconds unless the same one is still waiting.
+
+    Requests made while the job waits are served by that one run.
+    """
+    if Job.objects.filter(
+        task=task_name, status=Job.PENDING, payload=payload
+    ).exists():
+        return None
+    return Job.objects.create(
+        task=task_name,
+        payload=payload,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim_job():
+    """Take the next due job, or return None when the queue is empty.
+
+    A job is claimed by a conditional UPDATE, so several workers can poll
+    the same table. Jobs left running by a dead worker are requeued.
+    """
+    now = timezone.now()
+    Job.objects.filter(
+        status=Job.RUNNING,
+        updated_at__lt=now - timedelta(seconds=settings.JOB_TIMEOUT),
+    ).update(status=Job.PENDING, updated_at=now)
+    for job_id in Job.objects.filter(
+        status=Job.PENDING, run_after__lte=now
+    ).values_list('id', flat=True)[:10]:
+        if Job.objects.filter(pk=job_id, status=Job.PENDING).update(
+            status=Job.RUNNING, attempts=F('attempts') + 1, updated_at=now
+        ):
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+def run_job(job):
+    try:
+        TASKS[job.task](**job.payload)
+    except Exception:
+        failed = job.attempts >= settings.JOB_MAX_ATTEMPTS
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.FAILED if failed else Job.PENDING,
+            error=traceback.format_exc(),
+            run_after=timezone.now() + timedelta(
+                seconds=settings.JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+            ),
+            updated_at=timezone.now(),
+        )
+        return False
+    job.delete()
+    return True
+
+
+def run_pending_jobs(limit=None):
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_job()
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
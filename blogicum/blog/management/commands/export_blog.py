@@ -0,0 +1,79 @@
+import gzip
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from blog.exports import FORMATS, TABLES, WRITERS
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает авторов, категории, местоположения, публикации и '
+        'комментарии в файлы JSON Lines или CSV, по файлу на таблицу.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', help='Каталог, в который записываются файлы.'
+        )
+        parser.add_argument(
+            '--format', choices=FORMATS, default='jsonl',
+            help='Формат файлов.'
+        )
+        parser.add_argument(
+            '--gzip', action='store_true', help='Сжимать файлы gzip.'
+        )
+        parser.add_argument(
+            '--since',
+            help='Выгрузить только строки, изменённые или созданные не '
+                 'раньше этой даты или момента в формате ISO 8601. Авторы '
+                 'попадают в выгрузку только по дате регистрации, удалённые '
+                 'строки не выгружаются.'
+        )
+        parser.add_argument(
+            '--tables', nargs='+', choices=TABLES, default=list(TABLES),
+            help='Какие таблицы выгрузить.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Сколько строк читать из базы за раз.'
+        )
+
+    def parse_since(self, value):
+        if value is None:
+            return None
+        since = parse_datetime(value)
+        if since is None and parse_date(value):
+            since = parse_datetime(f'{value}T00:00')
+        if since is None:
+            raise CommandError(f'Некорректная дата --since: {value}.')
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def handle(self, *args, **options):
+        since = self.parse_since(options['since'])
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+        extension = options['format'] + ('.gz' if options['gzip'] else '')
+        for name in options['tables']:
+            model, columns, timestamp = TABLES[name]
+            rows = model.objects.order_by('pk').values_list(*columns)
+            if since:
+                rows = rows.filter(**{f'{timestamp}__gte': since})
+            path = output / f'{name}.{extension}'
+            opener = gzip.open if options['gzip'] else open
+            start = time.monotonic()
+            with opener(path, 'wt', encoding='utf-8', newline='') as stream:
+                count = WRITERS[options['format']](
+                    stream, columns,
+                    rows.iterator(chunk_size=options['chunk_size'])
+                )
+            self.stdout.write(
+                f'{name}: {count} строк за '
+                f'{time.monotonic() - start:.1f} с -> {path}'
+            )
+        self.stdout.write(self.style.SUCCESS('Выгрузка завершена.'))
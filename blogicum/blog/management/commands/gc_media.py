@@ -0,0 +1,139 @@
+import os
+import posixpath
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.template.defaultfilters import filesizeformat
+
+from blog.images import RENDITIONS_DIR
+from blog.models import MediaFile, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет изображения публикаций, счётчик ссылок на которые равен '
+        'нулю, и уменьшенные копии, на которые больше нет ссылок.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, что будет удалено.'
+        )
+        parser.add_argument(
+            '--min-age', type=int, default=3600,
+            help='Не трогать файлы моложе указанного числа секунд.'
+        )
+        parser.add_argument(
+            '--recount', action='store_true',
+            help='Сначала пересчитать ссылки на изображения по публикациям.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько файлов сверять с базой за один запрос.'
+        )
+
+    def iter_batches(self, storage, directory, exclude=None):
+        """Yield storage names of old enough files in bounded batches."""
+        root = storage.path(directory)
+        batch = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            if exclude:
+                dirnames[:] = [
+                    dirname for dirname in dirnames
+                    if os.path.join(dirpath, dirname) != exclude
+                ]
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                stat = os.stat(path)
+                if stat.st_mtime > self.cutoff:
+                    continue
+                batch.append((
+                    posixpath.join(
+                        directory,
+                        os.path.relpath(path, root).replace(os.sep, '/')
+                    ),
+                    stat.st_size,
+                ))
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def remove(self, storage, name, size):
+        self.removed += 1
+        self.freed += size
+        if self.verbosity > 1:
+            self.stdout.write(name)
+        if not self.dry_run:
+            storage.delete(name)
+
+    def collect_images(self, storage, directory):
+        for batch in self.iter_batches(
+            storage, directory, exclude=storage.path(RENDITIONS_DIR)
+        ):
+            names = [name for name, _ in batch]
+            if self.recount_images:
+                references = dict(
+                    Post.objects.filter(image__in=names)
+                    .order_by().values('image').annotate(count=Count('id'))
+                    .values_list('image', 'count')
+                )
+                if not self.dry_run:
+                    self.recount(names, references)
+            else:
+                references = dict(
+                    MediaFile.objects.filter(
+                        name__in=names, references__gt=0
+                    ).values_list('name', 'references')
+                )
+            for name, size in batch:
+                if name not in references:
+                    self.remove(storage, name, size)
+
+    def recount(self, names, references):
+        MediaFile.objects.filter(name__in=names).exclude(
+            name__in=references
+        ).delete()
+        files = MediaFile.objects.in_bulk(references, field_name='name')
+        for name, media_file in files.items():
+            media_file.references = references[name]
+        MediaFile.objects.bulk_update(files.values(), ['references'])
+        MediaFile.objects.bulk_create(
+            MediaFile(name=name, references=count)
+            for name, count in references.items() if name not in files
+        )
+
+    def collect_renditions(self):
+        for batch in self.iter_batches(default_storage, RENDITIONS_DIR):
+            digests = {
+                posixpath.basename(name).split('_')[0] for name, _ in batch
+            }
+            referenced = set(
+                Post.objects.filter(image_hash__in=digests)
+                .values_list('image_hash', flat=True)
+            )
+            for name, size in batch:
+                if posixpath.basename(name).split('_')[0] not in referenced:
+                    self.remove(default_storage, name, size)
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
+        self.recount_images = options['recount']
+        self.cutoff = time.time() - options['min_age']
+        self.removed = self.freed = 0
+        field = Post._meta.get_field('image')
+        if os.path.isdir(field.storage.path(field.upload_to)):
+            self.collect_images(field.storage, field.upload_to)
+        if os.path.isdir(default_storage.path(RENDITIONS_DIR)):
+            self.collect_renditions()
+        action = 'Будет удалено' if self.dry_run else 'Удалено'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} файлов: {self.removed}, '
+            f'{filesizeformat(self.freed)}.'
+        ))
@@ -0,0 +1,251 @@
+import gzip
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from blog.cache import SITE_SCOPE, bump_versions
+from blog.exports import FORMATS, READERS, TABLES, deserialize
+from blog.models import Job, MediaFile, User, recount_comments
+from blog.search import rebuild_search_index
+
+# Columns matching rows that already exist, so that they are reused
+# instead of duplicated. Posts and comments have no such key and are
+# added again when the same export is imported twice.
+NATURAL_KEYS = {
+    'authors': 'username',
+    'categories': 'slug',
+    'locations': 'name',
+}
+# Foreign key columns and the tables whose source ids they hold.
+FOREIGN_KEYS = {
+    'author_id': 'authors',
+    'category_id': 'categories',
+    'location_id': 'locations',
+    'post_id': 'posts',
+}
+
+
+def lock_tables(models):
+    """Keep other connections from inserting rows until the import commits.
+
+    Ids of new rows are counted from Max(pk), so no other insert may take
+    them. PostgreSQL locks the tables against writes; SQLite locks the
+    whole database for the first write of a transaction, so a write that
+    changes nothing is enough.
+    """
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('LOCK TABLE {} IN EXCLUSIVE MODE'.format(
+                ', '.join(quote(model._meta.db_table) for model in models)
+            ))
+        else:
+            cursor.execute(
+                f'UPDATE {quote(Job._meta.db_table)} SET id = id WHERE 1 = 0'
+            )
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает авторов, категории, местоположения, публикации и '
+        'комментарии из файлов, выгруженных командой export_blog. Авторы, '
+        'категории и местоположения сопоставляются с уже существующими, '
+        'а публикации и комментарии добавляются заново при каждой загрузке.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', help='Каталог с файлами выгрузки.'
+        )
+        parser.add_argument(
+            '--tables', nargs='+', choices=TABLES, default=list(TABLES),
+            help='Какие таблицы загрузить.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько строк вставлять за один запрос.'
+        )
+
+    def find_file(self, directory, name):
+        for extension in FORMATS:
+            for suffix in ('', '.gz'):
+                path = directory / f'{name}.{extension}{suffix}'
+                if path.exists():
+                    return path, extension
+        return None, None
+
+    def read(self, path, extension):
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'rt', encoding='utf-8', newline='') as stream:
+            yield from READERS[extension](stream)
+
+    def resolve(self, model, values):
+        """Replace source ids in foreign keys with ids in this database.
+
+        Returns False when a required related row was not imported.
+        """
+        for column, table in FOREIGN_KEYS.items():
+            if values.get(column) is None:
+                continue
+            values[column] = self.ids[table].get(values[column])
+            if values[column] is None and not (
+                model._meta.get_field(column).null
+            ):
+                return False
+        return True
+
+    def flush(self, model, batch):
+        """Insert the batch keeping imported timestamps.
+
+        bulk_create sets auto_now fields to the current time, so the
+        imported values are written back with bulk_update, which does not.
+        """
+        fields = [
+            field.attname for field in model._meta.fields
+            if getattr(field, 'auto_now', False)
+            or getattr(field, 'auto_now_add', False)
+        ]
+        stamps = [
+            [getattr(instance, field) for field in fields]
+            for instance in batch
+        ]
+        model.objects.bulk_create(batch, batch_size=self.batch_size)
+        if fields:
+            for instance, values in zip(batch, stamps):
+                for field, value in zip(fields, values):
+                    if value is not None:
+                        setattr(instance, field, value)
+            model.objects.bulk_update(
+                batch, fields, batch_size=self.batch_size
+            )
+        batch.clear()
+
+    def import_table(self, name, rows):
+        model, columns, _ = TABLES[name]
+        fields = {column: model._meta.get_field(column) for column in columns}
+        key = NATURAL_KEYS.get(name)
+        existing = dict(model.objects.values_list(key, 'pk')) if key else {}
+        ids = self.ids[name] = {}
+        next_id = (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        batch = []
+        counts = Counter()
+        for row in rows:
+            values = {
+                column: deserialize(field, row[column])
+                for column, field in fields.items() if column in row
+            }
+            source_id = values.pop('id')
+            if key and values[key] in existing:
+                ids[source_id] = existing[values[key]]
+                counts['existing'] += 1
+                continue
+            if not self.resolve(model, values):
+                counts['skipped'] += 1
+                continue
+            instance = model(pk=next_id, **values)
+            if model is User:
+                instance.set_unusable_password()
+            elif name == 'posts' and instance.image:
+                self.images.append((next_id, instance.image.name))
+            ids[source_id] = next_id
+            if key:
+                existing[values[key]] = next_id
+            next_id += 1
+            batch.append(instance)
+            counts['created'] += 1
+            if len(batch) >= self.batch_size:
+                self.flush(model, batch)
+        if batch:
+            self.flush(model, batch)
+        return counts
+
+    def register_images(self):
+        """Count references to imported images and queue renditions."""
+        references = Counter(name for _, name in self.images)
+        files = MediaFile.objects.in_bulk(references, field_name='name')
+        for name, media_file in files.items():
+            media_file.references += references[name]
+        MediaFile.objects.bulk_update(
+            files.values(), ['references'], batch_size=self.batch_size
+        )
+        MediaFile.objects.bulk_create(
+            (
+                MediaFile(name=name, references=count)
+                for name, count in references.items() if name not in files
+            ),
+            batch_size=self.batch_size,
+        )
+        Job.objects.bulk_create(
+            (
+                Job(
+                    task='render_post_image',
+                    payload={'post_id': post_id, 'image_name': name},
+                )
+                for post_id, name in self.images
+            ),
+            batch_size=self.batch_size,
+        )
+
+    def rebuild(self, models):
+        """Do once for all rows what signals do for single saves."""
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+        recount_comments()
+        rebuild_search_index()
+        self.register_images()
+        transaction.on_commit(lambda: bump_versions(SITE_SCOPE))
+
+    def handle(self, *args, **options):
+        directory = Path(options['input'])
+        if not directory.is_dir():
+            raise CommandError(f'Каталог {directory} не найден.')
+        self.batch_size = options['batch_size']
+        self.ids = {name: {} for name in TABLES}
+        self.images = []
+        models = []
+        total = 0
+        start = time.monotonic()
+        # One transaction for all tables and the rebuild: a failure leaves
+        # the database as it was, and ids counted from Max(pk) stay free
+        # until the import commits.
+        with transaction.atomic():
+            lock_tables([
+                TABLES[name][0] for name in TABLES
+                if name in options['tables']
+            ])
+            for name in TABLES:
+                if name not in options['tables']:
+                    continue
+                path, extension = self.find_file(directory, name)
+                if path is None:
+                    self.stdout.write(f'{name}: файл не найден, пропускаем.')
+                    continue
+                table_start = time.monotonic()
+                counts = self.import_table(name, self.read(path, extension))
+                elapsed = time.monotonic() - table_start
+                rows = sum(counts.values())
+                total += rows
+                models.append(TABLES[name][0])
+                self.stdout.write(
+                    f'{name}: добавлено {counts["created"]}, уже были '
+                    f'{counts["existing"]}, пропущено {counts["skipped"]} за '
+                    f'{elapsed:.1f} с '
+                    f'({rows / max(elapsed, 1e-6):.0f} строк/с)'
+                )
+            rebuild_start = time.monotonic()
+            self.rebuild(models)
+            self.stdout.write(
+                'Счётчики комментариев и поисковый индекс перестроены за '
+                f'{time.monotonic() - rebuild_start:.1f} с.'
+            )
+        elapsed = time.monotonic() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {total} строк за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-6):.0f} строк/с).'
+        ))
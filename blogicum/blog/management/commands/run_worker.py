@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в базе данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить задачи, готовые к запуску, и завершиться.'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста.'
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        try:
+            while True:
+                done = run_pending_jobs()
+                processed += done
+                if options['once']:
+                    break
+                if not done:
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f'Выполнено задач: {processed}.'
+        ))
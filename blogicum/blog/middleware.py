@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class ReplicaPinMiddleware(MiddlewareMixin):
+    """Pin a client to the default database for a while after it writes.
+
+    Replicas may lag behind, so pages read right after a successful POST
+    come from the default database and show the author their change.
+    """
+
+    def process_response(self, request, response):
+        if (
+            settings.REPLICA_DATABASES
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_TIMEOUT,
+                httponly=True, samesite='Lax',
+            )
+        return response
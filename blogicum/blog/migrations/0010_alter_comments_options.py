@@ -0,0 +1,44 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0009_alter_comments_post'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='comments',
+            options={'default_related_name': 'comments', 'ordering': ('created_at',), 'verbose_name': 'Коментарий', 'verbose_name_plural': 'Коментарии'},
+        ),
+        migrations.AlterModelOptions(
+            name='post',
+            options={'default_related_name': 'posts', 'ordering': ('-pub_date', 'title'), 'verbose_name': 'публикация', 'verbose_name_plural': 'Публикации'},
+        ),
+        migrations.AlterField(
+            model_name='comments',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to=settings.AUTH_USER_MODEL, verbose_name='Автор'),
+        ),
+        migrations.AlterField(
+            model_name='comments',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Оставлен'),
+        ),
+        migrations.AlterField(
+            model_name='comments',
+            name='post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='blog.post', verbose_name='Пост'),
+        ),
+        migrations.AlterField(
+            model_name='comments',
+            name='text',
+            field=models.TextField(verbose_name='Коментарий'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:40
+
+from django.conf import settings
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE blog_post_search USING fts5('
+            "title, text, comments, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            'INSERT INTO blog_post_search (rowid, title, text, comments) '
+            'SELECT p.id, p.title, p.text, COALESCE(('
+            "SELECT group_concat(c.text, ' ') FROM blog_comments c "
+            "WHERE c.post_id = p.id), '') FROM blog_post p"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE TABLE blog_post_search ('
+            'post_id integer PRIMARY KEY, document tsvector NOT NULL)'
+        )
+        schema_editor.execute(
+            'CREATE INDEX blog_post_search_document_idx '
+            'ON blog_post_search USING GIN (document)'
+        )
+        schema_editor.execute(
+            'INSERT INTO blog_post_search (post_id, document) '
+            "SELECT p.id, setweight(to_tsvector(%s, p.title), 'A') || "
+            "setweight(to_tsvector(%s, p.text), 'B') || "
+            "setweight(to_tsvector(%s, COALESCE(("
+            "SELECT string_agg(c.text, ' ') FROM blog_comments c "
+            "WHERE c.post_id = p.id), '')), 'C') FROM blog_post p",
+            [settings.SEARCH_CONFIG] * 3,
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute('DROP TABLE blog_post_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:38
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def enqueue_renditions(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Job = apps.get_model('blog', 'Job')
+    Job.objects.bulk_create(
+        Job(
+            task='render_post_image',
+            payload={'post_id': post_id, 'image_name': image_name},
+        )
+        for post_id, image_name in Post.objects.exclude(
+            image=''
+        ).values_list('id', 'image').iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_post_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=64, verbose_name='Задача')),
+                ('payload', models.JSONField(default=dict, verbose_name='Параметры')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('failed', 'Ошибка')], default='pending', max_length=16, verbose_name='Состояние')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Запустить после')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Изменено')),
+            ],
+            options={
+                'verbose_name': 'фоновая задача',
+                'verbose_name_plural': 'Фоновые задачи',
+                'ordering': ('run_after', 'id'),
+            },
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_renditions',
+            field=models.JSONField(default=dict, editable=False, verbose_name='Уменьшенные копии изображения'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['run_after', 'id'], name='job_pending_idx'),
+        ),
+        migrations.RunPython(enqueue_renditions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:44
+
+import blog.storage
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_references(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    MediaFile = apps.get_model('blog', 'MediaFile')
+    MediaFile.objects.bulk_create(
+        MediaFile(name=row['image'], references=row['references'])
+        for row in Post.objects.exclude(image='').order_by().values(
+            'image'
+        ).annotate(references=Count('id')).iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_post_image_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Файл')),
+                ('references', models.PositiveIntegerField(default=0, verbose_name='Ссылок')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+            ],
+            options={
+                'verbose_name': 'медиафайл',
+                'verbose_name_plural': 'Медиафайлы',
+            },
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, storage=blog.storage.ContentAddressedStorage(), upload_to='posts_images', verbose_name='Изображение'),
+        ),
+        migrations.RunPython(count_references, migrations.RunPython.noop),
+    ]
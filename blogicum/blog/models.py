@@ -1,8 +1,14 @@
+from datetime import datetime
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
-from django.db.models import Count
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from .storage import post_image_storage
+
 
 User = get_user_model()
 
@@ -29,6 +35,7 @@ class Category(PublicationModel):
                    'латиницы, цифры, дефис и подчёркивание.'),
         unique=True
     )
+    updated_at = models.DateTimeField(verbose_name='Изменено', auto_now=True)
 
     class Meta:
         verbose_name = 'категория'
@@ -40,6 +47,7 @@ class Category(PublicationModel):
 
 class Location(PublicationModel):
     name = models.CharField(verbose_name='Название места', max_length=256)
+    updated_at = models.DateTimeField(verbose_name='Изменено', auto_now=True)
 
     class Meta:
         verbose_name = 'местоположение'
@@ -78,14 +86,48 @@ class Post(PublicationModel):
     image = models.ImageField(
         'Изображение',
         upload_to='posts_images',
+        storage=post_image_storage,
         blank=True
     )
+    comment_count = models.PositiveIntegerField(
+        verbose_name='Количество комментариев',
+        default=0,
+        editable=False,
+    )
+    image_hash = models.CharField(
+        verbose_name='Хеш изображения',
+        max_length=64,
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
+    image_renditions = models.JSONField(
+        verbose_name='Уменьшенные копии изображения',
+        default=dict,
+        editable=False,
+    )
+    updated_at = models.DateTimeField(verbose_name='Изменено', auto_now=True)
 
     class Meta:
         default_related_name = 'posts'
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date', 'title')
+        indexes = (
+            models.Index(
+                fields=('-pub_date', 'title'),
+                condition=models.Q(is_published=True),
+                name='post_published_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', 'title'),
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', 'title'),
+                name='post_category_feed_idx',
+            ),
+        )
 
     def __str__(self):
         return f'Пост: {self.title[:20]} |Текст: {self.text[:40]}'
@@ -101,6 +143,7 @@ class Comments(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Оставлен')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Изменён')
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -112,11 +155,128 @@ class Comments(models.Model):
         verbose_name = 'Коментарий'
         verbose_name_plural = 'Коментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[20]
 
 
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    task = models.CharField(verbose_name='Задача', max_length=64)
+    payload = models.JSONField(verbose_name='Параметры', default=dict)
+    status = models.CharField(
+        verbose_name='Состояние',
+        max_length=16,
+        choices=STATUSES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток', default=0
+    )
+    run_after = models.DateTimeField(
+        verbose_name='Запустить после', default=timezone.now
+    )
+    error = models.TextField(verbose_name='Ошибка', blank=True)
+    created_at = models.DateTimeField(
+        verbose_name='Добавлено', auto_now_add=True
+    )
+    updated_at = models.DateTimeField(verbose_name='Изменено', auto_now=True)
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_after', 'id')
+        indexes = (
+            models.Index(
+                fields=('run_after', 'id'),
+                condition=models.Q(status='pending'),
+                name='job_pending_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.task} #{self.pk}'
+
+
+class MediaFile(models.Model):
+    name = models.CharField(verbose_name='Файл', max_length=255, unique=True)
+    references = models.PositiveIntegerField(
+        verbose_name='Ссылок', default=0
+    )
+    created_at = models.DateTimeField(
+        verbose_name='Добавлено', auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = 'медиафайл'
+        verbose_name_plural = 'Медиафайлы'
+
+    def __str__(self):
+        return self.name
+
+
+def acquire_media_file(name):
+    MediaFile.objects.get_or_create(name=name)
+    MediaFile.objects.filter(name=name).update(references=F('references') + 1)
+
+
+def release_media_file(name):
+    """Drop one reference to a stored file.
+
+    The file itself is left for `gc_media`: a concurrent upload of the
+    same content may already be reusing it before its post is saved.
+    """
+    MediaFile.objects.filter(name=name, references__gt=0).update(
+        references=F('references') - 1
+    )
+    MediaFile.objects.filter(name=name, references=0).delete()
+
+
+def recount_comments(posts=Post.objects):
+    return posts.update(comment_count=Coalesce(
+        Subquery(
+            Comments.objects
+            .filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        0
+    ))
+
+
+def get_publish_cutoff(now=None):
+    granularity = settings.POSTS_PUBLISH_CUTOFF_GRANULARITY
+    timestamp = (now or timezone.now()).timestamp()
+    return datetime.fromtimestamp(
+        timestamp - timestamp % granularity, tz=timezone.utc
+    )
+
+
+def get_published_filter(prefix=''):
+    """Filter visible posts, or related ones with a prefix like 'posts__'."""
+    return Q(**{
+        f'{prefix}pub_date__lte': get_publish_cutoff(),
+        f'{prefix}is_published': True,
+        f'{prefix}category__is_published': True,
+    })
+
+
 def get_filtered_posts(posts=Post.objects, filter_published=True,
                        selected_related=True, comment_count=True):
     if selected_related:
@@ -125,17 +285,9 @@ def get_filtered_posts(posts=Post.objects, filter_published=True,
             'author',
             'category',
         )
-    if comment_count:
-        posts = (
-            posts
-            .annotate(comment_count=Count("comments"))
-            .order_by(*posts.model._meta.ordering)
-        )
+    if not comment_count:
+        posts = posts.defer('comment_count')
 
     if filter_published:
-        posts = posts.filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True
-        )
+        posts = posts.filter(get_published_filter())
     return posts
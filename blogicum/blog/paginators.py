@@ -0,0 +1,136 @@
+import base64
+import json
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class CursorPage:
+    def __init__(self, object_list, paginator, next_cursor=None,
+                 previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset paginator over the queryset ordering plus primary key.
+
+    Pages are addressed by opaque tokens instead of numbers, so neither
+    OFFSET nor COUNT(*) is issued and deep pages cost the same as the first.
+    """
+
+    cursor_based = True
+
+    def __init__(self, queryset, per_page, ordering=None):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        ordering = list(ordering or queryset.query.order_by
+                        or queryset.model._meta.ordering)
+        if not {'pk', 'id', '-pk', '-id'} & set(ordering):
+            ordering.append('pk')
+        self.ordering = [
+            (name.lstrip('-'), name.startswith('-')) for name in ordering
+        ]
+
+    def _field(self, name):
+        if name == 'pk':
+            return self.queryset.model._meta.pk
+        return self.queryset.model._meta.get_field(name)
+
+    def encode_cursor(self, obj, reverse=False):
+        values = [
+            self._field(name).value_to_string(obj)
+            for name, _ in self.ordering
+        ]
+        return base64.urlsafe_b64encode(
+            json.dumps([values, reverse]).encode()
+        ).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            values, reverse = json.loads(base64.urlsafe_b64decode(
+                cursor + '=' * (-len(cursor) % 4)
+            ))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                self._field(name).to_python(value)
+                for (name, _), value in zip(self.ordering, values)
+            ], bool(reverse)
+        except Exception:
+            raise InvalidCursor('Некорректный курсор страницы.')
+
+    def _seek(self, values, reverse):
+        condition = Q()
+        for index, (name, descending) in enumerate(self.ordering):
+            lookup = 'lt' if descending != reverse else 'gt'
+            term = Q(**{f'{name}__{lookup}': values[index]})
+            for (previous, _), value in zip(self.ordering[:index], values):
+                term &= Q(**{previous: value})
+            condition |= term
+        return self.queryset.filter(condition)
+
+    def _order_by(self, reverse):
+        return [
+            f'{"-" if descending != reverse else ""}{name}'
+            for name, descending in self.ordering
+        ]
+
+    def page(self, cursor=None):
+        values, reverse = (
+            self.decode_cursor(cursor) if cursor else (None, False)
+        )
+        queryset = (
+            self._seek(values, reverse) if values else self.queryset
+        ).order_by(*self._order_by(reverse))
+        objects = list(queryset[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if reverse:
+            objects.reverse()
+        if not objects:
+            return CursorPage(objects, self)
+        has_next, has_previous = (
+            (bool(values), has_more) if reverse else (has_more, bool(values))
+        )
+        return CursorPage(
+            objects,
+            self,
+            next_cursor=(self.encode_cursor(objects[-1])
+                         if has_next else None),
+            previous_cursor=(self.encode_cursor(objects[0], reverse=True)
+                             if has_previous else None),
+        )
+
+    def get_page(self, cursor=None):
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page()
@@ -0,0 +1,45 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+_read_database = ContextVar('read_database', default=None)
+
+
+@contextmanager
+def read_from_replica():
+    """Route reads made inside the block to a random replica, if any."""
+    token = _read_database.set(
+        random.choice(settings.REPLICA_DATABASES)
+        if settings.REPLICA_DATABASES else None
+    )
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+class ReplicaRouter:
+    """Send reads inside read_from_replica() to a replica, writes to default.
+
+    Replicas are copies of the default database, so objects read from
+    them may be related to and saved as objects of the default one, and
+    migrations are applied to the default database only.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
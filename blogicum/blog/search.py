@@ -0,0 +1,135 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+from .models import Comments, Post
+
+
+SEARCH_TABLE = 'blog_post_search'
+TITLE_WEIGHT, TEXT_WEIGHT, COMMENTS_WEIGHT = 10.0, 1.0, 0.5
+
+
+def is_search_indexed():
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def get_search_terms(query):
+    return re.findall(r'\w+', query.lower())
+
+
+def _comments_sql():
+    if not settings.SEARCH_INCLUDE_COMMENTS:
+        return "''"
+    aggregate = (
+        "string_agg(c.text, ' ')" if connection.vendor == 'postgresql'
+        else "group_concat(c.text, ' ')"
+    )
+    return (
+        f'COALESCE((SELECT {aggregate} FROM {Comments._meta.db_table} c '
+        f'WHERE c.post_id = p.id), \'\')'
+    )
+
+
+def _insert_sql(where=''):
+    source = f'FROM {Post._meta.db_table} p {where}'
+    if connection.vendor == 'postgresql':
+        return (
+            f'INSERT INTO {SEARCH_TABLE} (post_id, document) '
+            f'SELECT p.id, '
+            f"setweight(to_tsvector(%s, p.title), 'A') || "
+            f"setweight(to_tsvector(%s, p.text), 'B') || "
+            f"setweight(to_tsvector(%s, {_comments_sql()}), 'C') {source} "
+            'ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document',
+            [settings.SEARCH_CONFIG] * 3,
+        )
+    return (
+        f'INSERT OR REPLACE INTO {SEARCH_TABLE} '
+        f'(rowid, title, text, comments) '
+        f'SELECT p.id, p.title, p.text, {_comments_sql()} {source}',
+        [],
+    )
+
+
+def _key_column():
+    return 'post_id' if connection.vendor == 'postgresql' else 'rowid'
+
+
+def remove_posts(post_ids):
+    post_ids = list(post_ids)
+    if not is_search_indexed() or not post_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(post_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} '
+            f'WHERE {_key_column()} IN ({placeholders})',
+            post_ids,
+        )
+
+
+def index_posts(post_ids):
+    post_ids = [post_id for post_id in post_ids if post_id is not None]
+    if not is_search_indexed() or not post_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(post_ids))
+    sql, params = _insert_sql(f'WHERE p.id IN ({placeholders})')
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + post_ids)
+
+
+def rebuild_search_index():
+    if not is_search_indexed():
+        return 0
+    sql, params = _insert_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def search_post_ids(query, limit=None, posts=Post.objects):
+    """Return ids of posts matching the query, best matches first.
+
+    Title matches outrank text matches, which outrank comment matches.
+    Only posts in `posts` are searched, so the limit counts visible ones.
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        return []
+    limit = limit or settings.SEARCH_RESULTS_LIMIT
+    if not is_search_indexed():
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(text__icontains=term)
+        return list(
+            posts.filter(condition).order_by().values_list('pk', flat=True)
+            [:limit]
+        )
+    posts_sql, posts_params = (
+        posts.order_by().values('pk').query.sql_with_params()
+    )
+    if connection.vendor == 'sqlite':
+        sql = (
+            f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s '
+            f'AND rowid IN ({posts_sql}) '
+            f'ORDER BY bm25({SEARCH_TABLE}, %s, %s, %s) LIMIT %s'
+        )
+        params = [
+            ' '.join(f'"{term}"*' for term in terms), *posts_params,
+            TITLE_WEIGHT, TEXT_WEIGHT, COMMENTS_WEIGHT, limit,
+        ]
+    else:
+        sql = (
+            f'SELECT post_id FROM {SEARCH_TABLE}, '
+            f'plainto_tsquery(%s, %s) query WHERE document @@ query '
+            f'AND post_id IN ({posts_sql}) '
+            f'ORDER BY ts_rank(document, query) DESC LIMIT %s'
+        )
+        params = [
+            settings.SEARCH_CONFIG, ' '.join(terms), *posts_params, limit,
+        ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
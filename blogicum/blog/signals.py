@@ -0,0 +1,191 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import (
+    FEED_SCOPE, SITE_SCOPE, SYNDICATION_SCOPE, author_scope, bump_versions,
+    category_scope, post_scope, sitemap_scope, syndication_scope)
+from .models import (
+    Category, Comments, Location, Post, User, acquire_media_file,
+    release_media_file)
+from .jobs import enqueue, enqueue_once
+from .search import index_posts, remove_posts
+
+
+def touch_post(post_id, comment_delta=0):
+    Post.objects.filter(pk=post_id).update(
+        comment_count=F('comment_count') + comment_delta,
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_init, sender=Comments)
+def remember_comment_post(sender, instance, **kwargs):
+    instance._loaded_post_id = (
+        None if 'post_id' in instance.get_deferred_fields()
+        else instance.post_id
+    )
+
+
+@receiver(post_save, sender=Comments)
+def count_saved_comment(sender, instance, created, **kwargs):
+    if created:
+        touch_post(instance.post_id, 1)
+    elif instance._loaded_post_id not in (None, instance.post_id):
+        touch_post(instance._loaded_post_id, -1)
+        touch_post(instance.post_id, 1)
+    else:
+        touch_post(instance.post_id)
+
+
+@receiver(post_delete, sender=Comments)
+def count_deleted_comment(sender, instance, **kwargs):
+    touch_post(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, **kwargs):
+    index_posts([instance.pk])
+
+
+@receiver(post_init, sender=Post)
+def remember_post_image(sender, instance, **kwargs):
+    instance._loaded_image = (
+        None if 'image' in instance.get_deferred_fields()
+        else instance.image.name
+    )
+
+
+@receiver(pre_save, sender=Post)
+def reset_image_renditions(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    if instance.image.name != instance._loaded_image:
+        instance.image_renditions = {}
+
+
+@receiver(post_save, sender=Post)
+def count_image_references(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    if instance.image.name == instance._loaded_image:
+        return
+    if instance.image:
+        acquire_media_file(instance.image.name)
+    if instance._loaded_image:
+        release_media_file(instance._loaded_image)
+
+
+@receiver(post_delete, sender=Post)
+def release_deleted_image(sender, instance, **kwargs):
+    if instance.image:
+        release_media_file(instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+def enqueue_image_renditions(sender, instance, update_fields=None,
+                             **kwargs):
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    if instance.image and instance.image.name != instance._loaded_image:
+        enqueue(
+            'render_post_image',
+            post_id=instance.pk,
+            image_name=instance.image.name,
+        )
+    instance._loaded_image = instance.image.name
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    remove_posts([instance.pk])
+
+
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def index_commented_post(sender, instance, **kwargs):
+    if not settings.SEARCH_INCLUDE_COMMENTS:
+        return
+    for post_id in {instance.post_id, instance._loaded_post_id} - {None}:
+        enqueue_once(
+            'index_post', delay=settings.SEARCH_REINDEX_DELAY,
+            post_id=post_id,
+        )
+
+
+@receiver(post_init, sender=Post)
+def remember_post_category(sender, instance, **kwargs):
+    instance._loaded_category_id = (
+        None if 'category_id' in instance.get_deferred_fields()
+        else instance.category_id
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    scopes = (
+        author_scope(instance.author.username),
+        *(category_scope(slug) for slug in Category.objects.filter(
+            pk__in={instance.category_id, instance._loaded_category_id}
+        ).values_list('slug', flat=True)),
+    )
+    bump_versions(
+        FEED_SCOPE,
+        SYNDICATION_SCOPE,
+        post_scope(instance.pk),
+        *scopes,
+        *(syndication_scope(scope) for scope in scopes),
+        sitemap_scope('posts', instance.pk),
+        sitemap_scope('profiles', instance.author_id),
+        *(
+            sitemap_scope('categories', category_id)
+            for category_id in {
+                instance.category_id, instance._loaded_category_id
+            } - {None}
+        ),
+    )
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def invalidate_commented_post(sender, instance, **kwargs):
+    post_ids = {instance.post_id, instance._loaded_post_id}
+    bump_versions(
+        FEED_SCOPE,
+        *(post_scope(post_id) for post_id in post_ids),
+        *(
+            scope
+            for slug, username in Post.objects.filter(
+                pk__in=post_ids
+            ).values_list('category__slug', 'author__username')
+            for scope in (category_scope(slug), author_scope(username))
+        ),
+    )
+    instance._loaded_post_id = instance.post_id
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_site(sender, instance, update_fields=None, **kwargs):
+    if sender is User and update_fields and 'username' not in update_fields:
+        return
+    bump_versions(SITE_SCOPE)
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
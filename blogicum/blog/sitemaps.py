@@ -0,0 +1,151 @@
+import hashlib
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+
+from .cache import SITE_SCOPE, get_versions, sitemap_scope
+from .models import (
+    Category, Post, User, get_filtered_posts, get_published_filter)
+
+
+SITEMAP_KEY = 'blog:sitemap:{}:{}:{}'
+CONTENT_TYPE = 'application/xml; charset=utf-8'
+HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<{} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+CHUNK_SIZE = 2000
+
+
+def get_visible_posts():
+    return get_filtered_posts(selected_related=False, comment_count=False)
+
+
+def get_post_entries(start, stop):
+    posts = get_visible_posts().filter(
+        pk__gte=start, pk__lt=stop
+    ).order_by('pk').values_list('pk', 'pub_date', 'updated_at')
+    return [
+        (reverse('blog:post_detail', args=[pk]), max(pub_date, updated_at))
+        for pk, pub_date, updated_at in posts.iterator(chunk_size=CHUNK_SIZE)
+    ]
+
+
+def latest_visible_pub_date(prefix):
+    """Aggregate the pub_date of the latest post get_filtered_posts shows."""
+    return Max(f'{prefix}pub_date', filter=get_published_filter(prefix))
+
+
+def get_category_entries(start, stop):
+    categories = Category.objects.filter(
+        is_published=True, pk__gte=start, pk__lt=stop
+    ).annotate(lastmod=latest_visible_pub_date('posts__')).order_by('pk')
+    return [
+        (reverse('blog:category_posts', args=[slug]), lastmod)
+        for slug, lastmod in categories.values_list(
+            'slug', 'lastmod'
+        ).iterator(chunk_size=CHUNK_SIZE)
+    ]
+
+
+def get_profile_entries(start, stop):
+    authors = User.objects.filter(pk__gte=start, pk__lt=stop).annotate(
+        lastmod=latest_visible_pub_date('posts__')
+    ).filter(lastmod__isnull=False).order_by('pk')
+    return [
+        (reverse('blog:profile', args=[username]), lastmod)
+        for username, lastmod in authors.values_list(
+            'username', 'lastmod'
+        ).iterator(chunk_size=CHUNK_SIZE)
+    ]
+
+
+# The model listed by each section, the post column holding its ids and
+# the function loading its entries.
+SECTIONS = {
+    'posts': (Post, 'pk', get_post_entries),
+    'categories': (Category, 'category_id', get_category_entries),
+    'profiles': (User, 'author_id', get_profile_entries),
+}
+
+
+def count_sections(model):
+    last_id = model.objects.aggregate(last_id=Max('pk'))['last_id'] or 0
+    return max(-(-last_id // settings.SITEMAP_SECTION_SIZE), 1)
+
+
+def render_index(request, counts):
+    yield HEADER.format('sitemapindex')
+    for section, count in counts.items():
+        for number in range(1, count + 1):
+            location = request.build_absolute_uri(
+                reverse('blog:sitemap_section', args=[section, number])
+            )
+            yield f'<sitemap><loc>{escape(location)}</loc></sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def render_section(request, entries):
+    yield HEADER.format('urlset')
+    for path, lastmod in entries:
+        yield f'<url><loc>{escape(request.build_absolute_uri(path))}</loc>'
+        if lastmod:
+            yield f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+        yield '</url>\n'
+    yield '</urlset>\n'
+
+
+def cache_chunks(key, chunks):
+    body = []
+    for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+    cache.set(key, ''.join(body), settings.SITEMAP_CACHE_TIMEOUT)
+
+
+# Queries run in the view: under ASGI streaming content is iterated in the
+# event loop, where the ORM is not allowed, so only rendering is streamed.
+def sitemap_index(request):
+    counts = {
+        section: count_sections(model)
+        for section, (model, _, _) in SECTIONS.items()
+    }
+    return StreamingHttpResponse(
+        render_index(request, counts), content_type=CONTENT_TYPE
+    )
+
+
+def sitemap_section(request, section, number):
+    """Stream one section of the sitemap: objects with ids in a range.
+
+    Id ranges keep every object in the same section as the tables grow.
+    The rendered section is cached until a post in the range changes, a
+    scheduled post in it is published or the site version changes.
+    """
+    if section not in SECTIONS or number < 1:
+        raise Http404
+    model, column, get_entries = SECTIONS[section]
+    size = settings.SITEMAP_SECTION_SIZE
+    start, stop = (number - 1) * size + 1, number * size + 1
+    latest = get_visible_posts().filter(**{
+        f'{column}__gte': start, f'{column}__lt': stop
+    }).aggregate(latest=Max('pub_date'))['latest']
+    key = SITEMAP_KEY.format(section, number, hashlib.md5(':'.join(
+        str(part) for part in (
+            request.get_host(), latest,
+            *get_versions(sitemap_scope(section, start), SITE_SCOPE),
+        )
+    ).encode()).hexdigest())
+    body = cache.get(key)
+    if body is not None:
+        return HttpResponse(body, content_type=CONTENT_TYPE)
+    if number > count_sections(model):
+        raise Http404
+    return StreamingHttpResponse(
+        cache_chunks(key, render_section(request, get_entries(start, stop))),
+        content_type=CONTENT_TYPE,
+    )
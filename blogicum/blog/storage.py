@@ -0,0 +1,36 @@
+import hashlib
+import os
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage that names files by the SHA-256 of their content.
+
+    Saving content that is already stored returns the existing name, so
+    identical uploads share one file. The reused file is touched, so that
+    `gc_media --min-age` spares it until the new reference is saved.
+    """
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        directory, basename = posixpath.split(name)
+        name = posixpath.join(
+            directory, digest[:2],
+            digest + os.path.splitext(basename)[1].lower()
+        )
+        if self.exists(name):
+            os.utime(self.path(name))
+            return name
+        return super().save(name, content, max_length)
+
+
+post_image_storage = ContentAddressedStorage()
@@ -0,0 +1,42 @@
+import posixpath
+
+from django.core.files.base import ContentFile
+from PIL import Image
+
+from .images import render_renditions, strip_metadata
+from .jobs import task
+from .models import Post
+from .search import index_posts
+
+
+@task
+def render_post_image(post_id, image_name):
+    """Render the renditions of a post image, stripping its metadata first.
+
+    An original with metadata is replaced by a stripped copy, which queues
+    this task again for the new file. The upload is then no longer
+    referenced and is removed by `gc_media`.
+    """
+    post = Post.objects.filter(pk=post_id, image=image_name).first()
+    if post is None:
+        return
+    with post.image.open() as source:
+        content = source.read()
+    try:
+        stripped = strip_metadata(content)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        stripped = None
+    if stripped is not None:
+        post.image.save(
+            posixpath.basename(image_name), ContentFile(stripped),
+            save=False,
+        )
+        post.save(update_fields=('image', 'updated_at'))
+        return
+    post.image_hash, post.image_renditions = render_renditions(post.image)
+    post.save(update_fields=('image_hash', 'image_renditions', 'updated_at'))
+
+
+@task
+def index_post(post_id):
+    index_posts([post_id])
@@ -0,0 +1,35 @@
+from django import template
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from blog.cache import SITE_SCOPE, get_versions, post_scope
+from blog.images import get_srcset
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card_version(post):
+    return ':'.join(
+        str(version)
+        for version in get_versions(post_scope(post.pk), SITE_SCOPE)
+    )
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, kind):
+    context = {'post': post, 'sizes': settings.POST_IMAGE_RENDITIONS[kind]}
+    if kind not in post.image_renditions:
+        return {**context, 'pending': True}
+    rendition = post.image_renditions[kind]
+    if rendition is None:
+        return context
+    sources, widths = rendition['sources'], rendition['widths']
+    return {
+        **context,
+        'rendition': rendition,
+        'src': default_storage.url(sources[rendition['fallback']][0]),
+        'srcset': get_srcset(sources[rendition['fallback']], widths),
+        'webp_srcset': get_srcset(sources['webp'], widths),
+    }
@@ -0,0 +1,85 @@
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """Pass uploads on to the next handlers while checking image limits.
+
+    Bytes are counted and the image header is read as chunks arrive, so
+    oversized files and decompression bombs are dropped before they are
+    stored or decoded. Rejections are collected in ``errors`` and the
+    SHA-256 of every accepted file in ``hashes``, both by field name.
+    """
+
+    header_limit = 512 * 1024
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.errors = {}
+        self.hashes = {}
+
+    def reject(self, message):
+        self.errors[self.field_name] = message
+        raise SkipFile
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+        self.header = b''
+        self.size_known = False
+        if (self.content_length or 0) > settings.POST_IMAGE_MAX_BYTES:
+            self.reject_size()
+
+    def reject_size(self):
+        self.reject(
+            'Размер файла не должен превышать '
+            f'{filesizeformat(settings.POST_IMAGE_MAX_BYTES)}.'
+        )
+
+    def reject_header(self):
+        self.reject(
+            'Не удалось определить размеры изображения по первым '
+            f'{filesizeformat(self.header_limit)} файла.'
+        )
+
+    def check_header(self):
+        try:
+            with Image.open(BytesIO(self.header)) as picture:
+                width, height = picture.size
+        except Image.DecompressionBombError:
+            width = height = settings.POST_IMAGE_MAX_PIXELS
+        except (OSError, EOFError, ValueError):
+            if len(self.header) >= self.header_limit:
+                self.reject_header()
+            return
+        self.size_known = True
+        self.header = b''
+        if width * height > settings.POST_IMAGE_MAX_PIXELS:
+            self.reject(
+                'Изображение не должно содержать больше '
+                f'{settings.POST_IMAGE_MAX_PIXELS:,} пикселей.'
+                .replace(',', ' ')
+            )
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.POST_IMAGE_MAX_BYTES:
+            self.reject_size()
+        self.digest.update(raw_data)
+        if not self.size_known:
+            self.header += raw_data
+            self.check_header()
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not self.size_known:
+            self.errors[self.field_name] = (
+                'Не удалось определить размеры изображения.'
+            )
+            return None
+        self.hashes[self.field_name] = self.digest.hexdigest()
+        return None
@@ -1,29 +1,54 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import feeds, sitemaps, views
 
 
 app_name = 'blog'
 
+
+def route(pattern, view, name):
+    """Build a path, serving the view asynchronously if in ASYNC_VIEWS."""
+    if f'{app_name}:{name}' in settings.ASYNC_VIEWS:
+        view = views.async_view(view)
+    return path(pattern, view, name=name)
+
+
 urlpatterns = [
-    path('profile/edit/', views.ProfileUpdateView.as_view(),
-         name='edit_profile'),
-    path('profile/<slug:username>/', views.ProfileDetailView.as_view(),
-         name='profile'),
-    path('posts/create/', views.PostCreateView.as_view(), name='create_post'),
-    path('posts/<int:post_id>/edit/', views.PostUpdateView.as_view(),
-         name='edit_post'),
-    path('posts/<int:post_id>/delete/',
-         views.PostDeleteView.as_view(), name='delete_post'),
-    path('posts/<int:post_id>/comment/', views.add_comment,
-         name='add_comment'),
-    path('posts/<int:post_id>/edit_comment/<comment_id>', views.edit_comment,
-         name='edit_comment'),
-    path('posts/<int:post_id>/delete_comment/<comment_id>',
-         views.delete_comment, name='delete_comment'),
-    path('posts/<int:post_id>/', views.PostDetailView.as_view(),
-         name='post_detail'),
-    path('category/<slug:category_slug>/',
-         views.CategoryPostListView.as_view(), name='category_posts'),
-    path('', views.PostsListView.as_view(), name='index'),
+    route('profile/edit/', views.ProfileUpdateView.as_view(),
+          name='edit_profile'),
+    route('profile/<slug:username>/', views.ProfileDetailView.as_view(),
+          name='profile'),
+    route('profile/<slug:username>/rss/', feeds.AuthorFeed(),
+          name='profile_rss'),
+    route('profile/<slug:username>/atom/', feeds.AtomAuthorFeed(),
+          name='profile_atom'),
+    route('posts/create/', views.PostCreateView.as_view(), name='create_post'),
+    route('posts/<int:post_id>/edit/', views.PostUpdateView.as_view(),
+          name='edit_post'),
+    route('posts/<int:post_id>/delete/',
+          views.PostDeleteView.as_view(), name='delete_post'),
+    route('posts/<int:post_id>/comment/', views.add_comment,
+          name='add_comment'),
+    route('posts/<int:post_id>/comments/', views.post_comments,
+          name='post_comments'),
+    route('posts/<int:post_id>/edit_comment/<comment_id>', views.edit_comment,
+          name='edit_comment'),
+    route('posts/<int:post_id>/delete_comment/<comment_id>',
+          views.delete_comment, name='delete_comment'),
+    route('posts/<int:post_id>/', views.PostDetailView.as_view(),
+          name='post_detail'),
+    route('category/<slug:category_slug>/',
+          views.CategoryPostListView.as_view(), name='category_posts'),
+    route('category/<slug:category_slug>/rss/', feeds.CategoryFeed(),
+          name='category_rss'),
+    route('category/<slug:category_slug>/atom/', feeds.AtomCategoryFeed(),
+          name='category_atom'),
+    route('sitemap.xml', sitemaps.sitemap_index, name='sitemap'),
+    route('sitemap-<slug:section>-<int:number>.xml', sitemaps.sitemap_section,
+          name='sitemap_section'),
+    route('rss/', feeds.PostsFeed(), name='rss'),
+    route('atom/', feeds.AtomPostsFeed(), name='atom'),
+    route('search/', views.SearchView.as_view(), name='search'),
+    route('', views.PostsListView.as_view(), name='index'),
 ]
@@ -1,16 +1,90 @@
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.db import close_old_connections
+from django.db.models import Case, Q, When
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
+from django.utils.http import urlencode
+from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import condition
 from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView)
 
+from .cache import (
+    FEED_SCOPE, SITE_SCOPE, author_scope, cache_page_response,
+    category_scope, get_page_cache_key, get_validators, get_versions,
+    is_page_cacheable, post_scope)
 from .form import CommentsForm, CustomUserChangeForm, PostForm
-from .models import Category, Comments, Post, User, get_filtered_posts
+from .models import (
+    Category, Comments, Post, User, get_filtered_posts, get_publish_cutoff,
+    get_published_filter)
+from .paginators import CursorPaginator
+from .routers import read_from_replica
+from .search import search_post_ids
+from .uploads import ImageUploadHandler
 
 
 PAGINATOR_BY = 10
+COMMENTS_PAGINATE_BY = 20
+
+
+def async_view(view):
+    """Turn a sync view into a coroutine running it on a pool thread.
+
+    Under ASGI Django runs sync views one at a time on a single thread.
+    Wrapped views run concurrently, each thread with its own database
+    connection, closed by the usual CONN_MAX_AGE rules.
+    """
+    def run(request, *args, **kwargs):
+        close_old_connections()
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+        finally:
+            close_old_connections()
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await sync_to_async(run, thread_sensitive=False)(
+            request, *args, **kwargs
+        )
+
+    return wrapper
+
+
+def get_posts_page(request, posts, per_page=PAGINATOR_BY):
+    if settings.POSTS_CURSOR_PAGINATION:
+        return CursorPaginator(posts, per_page).get_page(
+            request.GET.get('cursor')
+        )
+    return Paginator(posts, per_page).get_page(request.GET.get('page'))
+
+
+def get_visible_post(user, post_id):
+    visible = get_published_filter()
+    if user.is_authenticated:
+        visible |= Q(author=user)
+    return get_object_or_404(
+        get_filtered_posts(filter_published=False).filter(visible),
+        pk=post_id
+    )
+
+
+def get_comments_page(post, cursor=None):
+    return CursorPaginator(
+        post.comments.select_related('author'), COMMENTS_PAGINATE_BY
+    ).get_page(cursor)
 
 
 class FormValidMixin:
@@ -27,6 +101,90 @@ class OnlyAuthorMixin(UserPassesTestMixin):
         return redirect('blog:post_detail', post_id=self.get_object().pk)
 
 
+class CacheScopesMixin:
+    cache_scopes = ()
+
+    def get_cache_scopes(self):
+        return (*self.cache_scopes, SITE_SCOPE)
+
+
+class ConditionalGetMixin(CacheScopesMixin):
+    def get_modified(self):
+        return None
+
+    def get_validators(self):
+        return get_validators(
+            self.request, self.get_cache_scopes(), self.get_modified()
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        return condition(
+            etag_func=lambda *args, **kwargs: etag,
+            last_modified_func=lambda *args, **kwargs: last_modified,
+        )(super().dispatch)(request, *args, **kwargs)
+
+
+class AnonymousPageCacheMixin(CacheScopesMixin):
+    def dispatch(self, request, *args, **kwargs):
+        if not is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+        key = get_page_cache_key(request, self.get_cache_scopes())
+        response = cache.get(key)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            response.add_post_render_callback(
+                lambda response: cache_page_response(request, key, response)
+            )
+        return response
+
+
+class ReplicaReadMixin(CacheScopesMixin):
+    """Serve the page from a replica unless it or the client has just changed.
+
+    Goes first among the bases so that validators, the page cache and the
+    template, which evaluates querysets lazily, all read from the replica.
+    A page whose versions were bumped within REPLICA_LAG is read from the
+    default database, so that a lagging replica does not fill the caches
+    under the new versions with stale data.
+    """
+
+    def changed_recently(self):
+        return max(get_versions(*self.get_cache_scopes())) > (
+            time.time() - settings.REPLICA_LAG
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            not settings.REPLICA_DATABASES
+            or settings.REPLICA_PIN_COOKIE in request.COOKIES
+            or self.changed_recently()
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replica():
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        return response
+
+
+class ImageUploadMixin:
+    """Check uploaded images while the request body is being read.
+
+    Upload handlers can only be changed before the body is parsed, which
+    the CSRF middleware would do first, so the check runs in the view.
+    """
+
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        self.upload = ImageUploadHandler(request)
+        request.upload_handlers.insert(0, self.upload)
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
+    def get_form_kwargs(self):
+        return {**super().get_form_kwargs(), 'upload': self.upload}
+
+
 class PostChangeMixin:
     model = Post
     form_class = PostForm
@@ -38,8 +196,18 @@ class PostsListMixin:
     model = Post
     paginate_by = PAGINATOR_BY
 
+    def paginate_queryset(self, queryset, page_size):
+        if not settings.POSTS_CURSOR_PAGINATION:
+            return super().paginate_queryset(queryset, page_size)
+        page = get_posts_page(self.request, queryset, page_size)
+        return page.paginator, page, page.object_list, page.has_other_pages()
+
+    def get_modified(self):
+        return self.get_queryset().values_list('pub_date', flat=True).first()
 
-class PostCreateView(FormValidMixin, LoginRequiredMixin, CreateView):
+
+class PostCreateView(ImageUploadMixin, FormValidMixin, LoginRequiredMixin,
+                     CreateView):
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
@@ -48,8 +216,8 @@ class PostCreateView(FormValidMixin, LoginRequiredMixin, CreateView):
         return reverse('blog:profile', args=[self.request.user.username])
 
 
-class PostUpdateView(FormValidMixin, OnlyAuthorMixin, PostChangeMixin,
-                     UpdateView):
+class PostUpdateView(ImageUploadMixin, FormValidMixin, OnlyAuthorMixin,
+                     PostChangeMixin, UpdateView):
     def get_success_url(self):
         return reverse('blog:post_detail', args=[self.object.pk])
 
@@ -65,36 +233,54 @@ class PostDeleteView(OnlyAuthorMixin, PostChangeMixin, DeleteView):
         return reverse('blog:profile', args=[self.request.user.username])
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ReplicaReadMixin, ConditionalGetMixin,
+                     AnonymousPageCacheMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    def get_cache_scopes(self):
+        return (post_scope(self.kwargs['post_id']), SITE_SCOPE)
+
+    @cached_property
+    def post(self):
+        return get_visible_post(self.request.user, self.kwargs['post_id'])
+
+    def get_modified(self):
+        if self.post.pub_date <= get_publish_cutoff():
+            return max(self.post.updated_at, self.post.pub_date)
+        return self.post.updated_at
+
     def get_object(self, queryset=None):
-        post = super().get_object(queryset=queryset,)
-        if post.author == self.request.user:
-            return post
-        return get_object_or_404(
-            get_filtered_posts(selected_related=False, comment_count=False),
-            id=post.id
-        )
+        return self.post
 
     def get_context_data(self, **kwargs):
         return super().get_context_data(
             **kwargs,
             form=CommentsForm(),
-            comments=self.object.comments.select_related('author')
+            comments=get_comments_page(
+                self.object, self.request.GET.get('comments')
+            )
         )
 
 
-class PostsListView(PostsListMixin, ListView):
+class PostsListView(ReplicaReadMixin, ConditionalGetMixin,
+                    AnonymousPageCacheMixin, PostsListMixin, ListView):
     template_name = 'blog/index.html'
-    queryset = get_filtered_posts()
+    cache_scopes = (FEED_SCOPE,)
+
+    def get_queryset(self):
+        return get_filtered_posts()
 
 
-class CategoryPostListView(PostsListMixin, ListView):
+class CategoryPostListView(ReplicaReadMixin, ConditionalGetMixin,
+                           AnonymousPageCacheMixin, PostsListMixin,
+                           ListView):
     template_name = 'blog/category.html'
 
+    def get_cache_scopes(self):
+        return (category_scope(self.kwargs['category_slug']), SITE_SCOPE)
+
     def get_queryset(self):
         return get_filtered_posts(posts=self.get_category().posts)
 
@@ -109,24 +295,64 @@ class CategoryPostListView(PostsListMixin, ListView):
         )
 
 
-class ProfileDetailView(DetailView):
+class SearchView(ListView):
+    model = Post
+    template_name = 'blog/search.html'
+    paginate_by = PAGINATOR_BY
+
+    def get_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        posts = get_filtered_posts()
+        post_ids = search_post_ids(self.get_query(), posts=posts)
+        return posts.filter(pk__in=post_ids).order_by(
+            Case(*(
+                When(pk=post_id, then=position)
+                for position, post_id in enumerate(post_ids)
+            ), default=len(post_ids))
+        )
+
+    def get_context_data(self, **kwargs):
+        query = self.get_query()
+        return super().get_context_data(
+            **kwargs,
+            query=query,
+            page_query=urlencode({'q': query}) + '&',
+        )
+
+
+class ProfileDetailView(ReplicaReadMixin, ConditionalGetMixin, DetailView):
     model = User
     template_name = 'blog/profile.html'
     slug_url_kwarg = 'username'
     slug_field = 'username'
     context_object_name = 'profile'
 
+    def get_cache_scopes(self):
+        return (author_scope(self.kwargs['username']), SITE_SCOPE)
+
+    def get_modified(self):
+        return get_filtered_posts(
+            posts=Post.objects.filter(
+                author__username=self.kwargs['username']
+            ),
+            filter_published=(
+                self.request.user.get_username() != self.kwargs['username']
+            )
+        ).values_list('pub_date', flat=True).first()
+
     def get_context_data(self, **kwargs):
         author = self.get_object()
         return super().get_context_data(
             **kwargs,
-            page_obj=Paginator(
+            page_obj=get_posts_page(
+                self.request,
                 get_filtered_posts(
                     posts=author.posts,
                     filter_published=(self.request.user != author)
-                ),
-                PAGINATOR_BY
-            ).get_page(self.request.GET.get('page'))
+                )
+            )
         )
 
 
@@ -145,6 +371,14 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
+def post_comments(request, post_id):
+    post = get_visible_post(request.user, post_id)
+    return render(request, 'includes/comment_list.html', {
+        'post': post,
+        'comments': get_comments_page(post, request.GET.get('cursor')),
+    })
+
+
 @login_required
 def add_comment(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
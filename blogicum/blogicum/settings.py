@@ -13,6 +13,7 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -28,6 +29,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.CachedUserMiddleware',
+    'blog.middleware.ReplicaPinMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -61,6 +64,20 @@ DATABASES = {
     }
 }
 
+# Cache version stamps, rendered fragments and pages, sessions and session
+# users must be shared by all worker processes, otherwise an edit handled
+# by one process leaves the others serving stale content. A process-local
+# backend (LocMemCache) is therefore refused when DEBUG is off. The file
+# cache in the project directory is shared by processes of this checkout;
+# settings_production uses memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -108,6 +125,99 @@ DATE_FORMAT = 'F j, Y'
 
 DATETIME_FORMAT = 'F j, Y, H:i'
 
+# Keyset pagination of the post feeds: pages are addressed by an opaque
+# ?cursor= token instead of ?page=N and no COUNT(*) query is issued.
+POSTS_CURSOR_PAGINATION = False
+
+# Published posts are selected with pub_date <= now rounded down to this
+# many seconds, so feed queries within one window are identical and can
+# share cache entries. Scheduled posts appear with at most this delay.
+POSTS_PUBLISH_CUTOFF_GRANULARITY = 60
+
+# Seconds an index, category or post page rendered for an anonymous visitor
+# is served from the cache. Edits invalidate it at once; this bounds how
+# late a scheduled post can appear. 0 disables the page cache.
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 60
+
+# RSS and Atom feeds: how many latest posts they list and how long a
+# rendered feed is kept. A cached feed is replaced as soon as a post in
+# it changes or a scheduled post is published.
+SYNDICATION_ITEMS = 20
+SYNDICATION_CACHE_TIMEOUT = 24 * 60 * 60
+
+# sitemap.xml lists sections of posts, categories and profiles, each
+# covering this many ids, so a section stays well under the 50 000 URL
+# limit. A rendered section is cached until its posts or the site change.
+SITEMAP_SECTION_SIZE = 10000
+SITEMAP_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Objects per page of the JSON API at /api/v1/.
+API_PAGE_SIZE = 20
+
+# Full-text search over posts: whether comment texts are indexed too, how
+# many ranked matches a search returns at most, and the PostgreSQL text
+# search configuration (ignored on SQLite, which uses FTS5). Comment changes
+# reach the index through a background job run SEARCH_REINDEX_DELAY seconds
+# later, so a burst of comments on one post reindexes it once.
+SEARCH_INCLUDE_COMMENTS = True
+SEARCH_REINDEX_DELAY = 10
+SEARCH_RESULTS_LIMIT = 1000
+SEARCH_CONFIG = 'russian'
+
+# Widths in CSS pixels of the post image renditions shown on cards and on the
+# post page; each is also rendered at the listed pixel densities.
+POST_IMAGE_RENDITIONS = {'card': 480, 'detail': 608}
+POST_IMAGE_DENSITIES = (1, 2)
+POST_IMAGE_QUALITY = 80
+
+# Limits checked while a post image is uploaded, before it is stored or
+# decoded: size in bytes and width times height in pixels.
+POST_IMAGE_MAX_BYTES = 10 * 1024 * 1024
+POST_IMAGE_MAX_PIXELS = 40_000_000
+
+# Background jobs run by `manage.py run_worker`: attempts before a job is
+# marked failed, base retry delay in seconds (doubled on every attempt), and
+# seconds after which a job left running by a dead worker is requeued.
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 30
+JOB_TIMEOUT = 600
+
+# Sessions are read from the shared cache and written through to the
+# database; 'django.contrib.sessions.backends.signed_cookies' avoids both.
+# The user of a session is kept in the shared cache for USER_CACHE_TIMEOUT
+# seconds (0 disables it); saving or deleting the user drops the entry.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+USER_CACHE_TIMEOUT = 30
+
+# The feed, category, profile and post pages read from a random alias in
+# REPLICA_DATABASES, e.g. ['replica'] with DATABASES['replica'] set to a
+# copy of the default database. After a POST the client keeps reading from
+# 'default' for REPLICA_PIN_TIMEOUT seconds to see its own changes, and
+# pages changed within REPLICA_LAG seconds, the most replicas may lag
+# behind, are read from 'default' by everyone.
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+REPLICA_DATABASES = []
+REPLICA_PIN_COOKIE = 'replica_pin'
+REPLICA_PIN_TIMEOUT = 10
+REPLICA_LAG = 10
+
+# Routes served by async views under ASGI, e.g. {'blog:index',
+# 'blog:category_posts', 'blog:profile', 'blog:post_detail'}. Their queries
+# run concurrently on pool threads instead of queueing for the one thread
+# Django gives sync views, as long as every middleware is async-capable
+# (the debug toolbar is not).
+ASYNC_VIEWS = set()
+
+# PRAGMA statements run on every new SQLite connection. WAL lets readers
+# work alongside a writer and busy_timeout (ms) makes concurrent writers
+# wait for the lock instead of failing with "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+    'mmap_size': 64 * 1024 * 1024,
+}
+
 HOST = '127.0.0.1'
 if DEBUG:
     INTERNAL_IPS = [HOST]
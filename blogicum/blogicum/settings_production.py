@@ -0,0 +1,87 @@
+"""Production settings, configured through environment variables.
+
+Use with DJANGO_SETTINGS_MODULE=blogicum.settings_production. Requires
+DJANGO_SECRET_KEY, DJANGO_ALLOWED_HOSTS and DJANGO_CACHE_LOCATION (comma
+separated memcached servers, e.g. 127.0.0.1:11211).
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401, F403
+from .settings import (
+    DATABASES, INSTALLED_APPS, MIDDLEWARE, SQLITE_PRAGMAS, TEMPLATES
+)
+
+
+def env(name, default=None):
+    value = os.environ.get(name, default)
+    if value is None:
+        raise ImproperlyConfigured(f'Set the {name} environment variable.')
+    return value
+
+
+DEBUG = False
+
+SECRET_KEY = env('DJANGO_SECRET_KEY')
+
+ALLOWED_HOSTS = [
+    host.strip() for host in env('DJANGO_ALLOWED_HOSTS').split(',')
+    if host.strip()
+]
+
+DEBUG_APPS = ('debug_toolbar',)
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in DEBUG_APPS]
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware.split('.')[0] not in DEBUG_APPS
+]
+INTERNAL_IPS = []
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'context_processors': [
+            processor
+            for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+            if processor != 'django.template.context_processors.debug'
+        ],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+
+DATABASES = {
+    'default': {
+        **DATABASES['default'],
+        'NAME': env('DJANGO_DB_PATH', DATABASES['default']['NAME']),
+        'CONN_MAX_AGE': int(env('DJANGO_CONN_MAX_AGE', '600')),
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': env(
+            'DJANGO_CACHE_BACKEND',
+            'django.core.cache.backends.memcached.PyMemcacheCache',
+        ),
+        'LOCATION': [
+            server.strip()
+            for server in env('DJANGO_CACHE_LOCATION').split(',')
+            if server.strip()
+        ],
+    }
+}
+
+SQLITE_PRAGMAS = {
+    **SQLITE_PRAGMAS,
+    'synchronous': 'NORMAL',
+    'mmap_size': int(env('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+    'cache_size': -int(env('SQLITE_CACHE_SIZE_KIB', '65536')),
+}
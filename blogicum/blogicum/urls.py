@@ -9,6 +9,7 @@ urlpatterns = [
     path('auth/', include('users.urls')),
     path('pages/', include('pages.urls', namespace='pages')),
     path('admin/', admin.site.urls),
+    path('api/v1/', include('api.urls', namespace='api')),
     path('', include('blog.urls', namespace='blog')),
 ]
 
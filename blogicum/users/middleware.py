@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.contrib import auth
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+
+USER_KEY = 'users:user:{}'
+
+
+def get_cached_user(request):
+    """Return the session user, reusing a recent lookup from the cache.
+
+    The entry is shared by all processes and dropped whenever the user
+    is saved or deleted. It is used only while its session auth hash
+    matches the session, so a password change ends other sessions at once.
+    """
+    user_id = request.session.get(auth.SESSION_KEY)
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if user_id is None or session_hash is None:
+        return auth.get_user(request)
+    key = USER_KEY.format(user_id)
+    user = cache.get(key)
+    if user is None or not constant_time_compare(
+        user.get_session_auth_hash(), session_hash
+    ):
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+class CachedUserMiddleware(MiddlewareMixin):
+    def process_request(self, request):
+        if settings.USER_CACHE_TIMEOUT:
+            request.user = SimpleLazyObject(
+                lambda: get_cached_user(request)
+            )
@@ -0,0 +1,12 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .middleware import USER_KEY
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def forget_user(sender, instance, **kwargs):
+    cache.delete(USER_KEY.format(instance.pk))
@@ -1,5 +1,8 @@
+import json
 import os
 import re
+import subprocess
+import sys
 import time
 from http import HTTPStatus
 from inspect import getsource
@@ -41,6 +44,55 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True, scope="session")
+def local_cache():
+    """Keep test runs off the project cache and out of each other's way."""
+    with override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }}):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def shared_cache(tmp_path, settings):
+    """Use a file cache that run_in_another_process shares."""
+    settings.CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(tmp_path / "cache"),
+    }}
+
+
+def run_in_another_process(code: str) -> None:
+    """Run Django code in a new interpreter, as another worker would.
+
+    The process gets the caches of the test, see the shared_cache fixture.
+    """
+    from django.conf import settings
+
+    setup = (
+        "import json\n"
+        "import django\n"
+        "from blogicum import settings\n"
+        f"settings.CACHES = json.loads({json.dumps(settings.CACHES)!r})\n"
+        "django.setup()\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", setup + code],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "blogicum.settings"},
+        check=True,
+    )
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -363,6 +415,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
@@ -140,3 +140,33 @@ def create_post_context_form_item(
         ),
     )
     return result
+
+
+@pytest.fixture
+def blend_post(mixer: Mixer, user, published_category):
+    def blend(**values):
+        return mixer.blend("blog.Post", **{
+            "author": user,
+            "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **values,
+        })
+    return blend
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def page_urls(post_with_published_location):
+    post = post_with_published_location
+    return {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+        "detail": f"/posts/{post.id}/",
+    }
@@ -0,0 +1,134 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(post_with_published_location):
+    return post_with_published_location
+
+
+def get_json(client, url, status=HTTPStatus.OK):
+    response = client.get(url)
+    assert response.status_code == status, (
+        f"Убедитесь, что `{url}` отвечает кодом {status}."
+    )
+    return response.json()
+
+
+def test_post_list_uses_cursor_pagination(
+        settings, many_posts_with_published_locations, client
+):
+    settings.API_PAGE_SIZE = 7
+    page = get_json(client, "/api/v1/posts/")
+    ids = [post["id"] for post in page["results"]]
+    while page["next"]:
+        page = get_json(client, page["next"])
+        ids += [post["id"] for post in page["results"]]
+    assert sorted(ids) == sorted(
+        post.id for post in many_posts_with_published_locations
+    ), "Убедитесь, что курсоры API проходят по всем публикациям."
+    assert get_json(
+        client, "/api/v1/posts/?cursor=broken", HTTPStatus.BAD_REQUEST
+    )["detail"]
+
+
+def test_sparse_fields_limit_output_and_query(post, client):
+    with CaptureQueriesContext(connection) as queries:
+        data = get_json(client, f"/api/v1/posts/{post.id}/?fields=id,title")
+    assert data == {"id": post.id, "title": post.title}
+    assert len(queries) == 2, (
+        "Убедитесь, что API не догружает отложенные поля по одному."
+    )
+    sql = queries[-1]["sql"]
+    assert '"blog_post"."text"' not in sql and "auth_user" not in sql, (
+        "Убедитесь, что API загружает из базы только запрошенные поля."
+    )
+    data = get_json(client, f"/api/v1/posts/{post.id}/?fields=author")
+    assert data == {"author": post.author.username}
+    assert get_json(
+        client, "/api/v1/posts/?fields=secret", HTTPStatus.BAD_REQUEST
+    )["detail"]
+
+
+def test_post_list_query_count(many_posts_with_published_locations, client):
+    with CaptureQueriesContext(connection) as queries:
+        get_json(client, "/api/v1/posts/")
+    assert len(queries) == 2, (
+        "Убедитесь, что список публикаций API выполняет не больше двух "
+        "запросов независимо от числа публикаций."
+    )
+
+
+def test_hidden_posts_are_not_served(post, mixer, client):
+    hidden = mixer.blend(
+        "blog.Post", is_published=False, category=post.category,
+        author=post.author,
+    )
+    get_json(client, f"/api/v1/posts/{hidden.id}/", HTTPStatus.NOT_FOUND)
+    get_json(
+        client, f"/api/v1/posts/{hidden.id}/comments/", HTTPStatus.NOT_FOUND
+    )
+    ids = [item["id"] for item in get_json(client, "/api/v1/posts/")[
+        "results"
+    ]]
+    assert hidden.id not in ids
+
+
+def test_comment_queryset_outside_dispatch(post, mixer):
+    from api.views import CommentListView
+
+    hidden = mixer.blend("blog.Post", is_published=False)
+    def get_queryset(post_id):
+        view = CommentListView()
+        view.setup(RequestFactory().get("/"), post_id=post_id)
+        return view.get_queryset()
+
+    assert list(get_queryset(post.id)) == [], (
+        "Убедитесь, что `CommentListView.get_queryset` работает и без "
+        "предварительного вызова `get_modified`."
+    )
+    with pytest.raises(Http404):
+        get_queryset(hidden.id)
+
+
+def test_related_resources(post, mixer, client):
+    comment = mixer.blend("blog.Comments", post=post)
+    assert get_json(
+        client, f"/api/v1/posts/{post.id}/comments/?fields=id,text,author"
+    )["results"] == [{
+        "id": comment.id,
+        "text": comment.text,
+        "author": comment.author.username,
+    }], "Убедитесь, что API отдаёт комментарии к публикации."
+    assert get_json(
+        client, f"/api/v1/categories/{post.category.slug}/"
+    )["title"] == post.category.title
+    assert get_json(
+        client, f"/api/v1/locations/{post.location.id}/"
+    )["name"] == post.location.name
+    assert get_json(
+        client, f"/api/v1/authors/{post.author.username}/"
+    )["username"] == post.author.username
+
+
+def test_api_etag(post, client):
+    url = f"/api/v1/posts/{post.id}/"
+    etag = client.get(url)["ETag"]
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что API отвечает 304 на запрос с актуальным ETag."
+    )
+    assert len(queries) <= 1
+    post.title = "Новый заголовок"
+    post.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).json()["title"] == (
+        "Новый заголовок"
+    )
@@ -0,0 +1,174 @@
+import asyncio
+import importlib
+import statistics
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db.backends.utils import CursorWrapper
+from django.test import AsyncClient
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+CONCURRENT_REQUESTS = 8
+ROUNDS = 3
+QUERY_LATENCY = 0.005
+ROUTES = ("blog:index", "blog:post_detail", "blog:category_posts",
+          "blog:profile")
+
+
+@pytest.fixture
+def slow_database(monkeypatch):
+    """Add network-like latency to every query, as with a remote DB.
+
+    Returns a dict with the largest number of queries run at once.
+    """
+    execute = CursorWrapper.execute
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def slow_execute(self, *args, **kwargs):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        try:
+            time.sleep(QUERY_LATENCY)
+            return execute(self, *args, **kwargs)
+        finally:
+            with lock:
+                running["now"] -= 1
+
+    monkeypatch.setattr(CursorWrapper, "execute", slow_execute)
+    return running
+
+
+@pytest.fixture
+def async_routes(monkeypatch):
+    from blog import urls, views
+
+    def enable():
+        for pattern in urls.urlpatterns:
+            if f"blog:{pattern.name}" in ROUTES:
+                monkeypatch.setattr(
+                    pattern, "callback", views.async_view(pattern.callback)
+                )
+
+    return enable
+
+
+async def fetch_concurrently(url):
+    client = AsyncClient()
+    await client.get(url)
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.get(url) for _ in range(CONCURRENT_REQUESTS))
+        )
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), responses
+
+
+@pytest.fixture
+def page_urls_under_asgi(many_posts_with_published_locations, settings):
+    settings.ANONYMOUS_PAGE_CACHE_TIMEOUT = 0
+    settings.MIDDLEWARE = [
+        middleware for middleware in settings.MIDDLEWARE
+        if not middleware.startswith("debug_toolbar")
+    ]
+    post = many_posts_with_published_locations[0]
+    return (
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+
+
+def test_async_views_serve_requests_concurrently(
+        page_urls_under_asgi, slow_database, async_routes, client
+):
+    urls = page_urls_under_asgi
+    expected = {url: client.get(url).content for url in urls}
+    async_routes()
+    for url in urls:
+        slow_database["peak"] = 0
+        _, responses = asyncio.run(fetch_concurrently(url))
+        for response in responses:
+            assert response.status_code == HTTPStatus.OK, (
+                f"Убедитесь, что страница `{url}` доступна под ASGI."
+            )
+            assert response.content == expected[url], (
+                f"Убедитесь, что асинхронное представление `{url}` "
+                "отдаёт ту же страницу, что и синхронное."
+            )
+        assert slow_database["peak"] > 1, (
+            f"Убедитесь, что асинхронное представление `{url}` "
+            "обрабатывает одновременные запросы параллельно."
+        )
+
+
+@pytest.mark.benchmark
+def test_async_views_serve_concurrent_requests_faster(
+        page_urls_under_asgi, slow_database, async_routes, capsys
+):
+    urls = page_urls_under_asgi
+    timings = {}
+    for mode in ("sync", "async"):
+        if mode == "async":
+            async_routes()
+        for url in urls:
+            elapsed, responses = asyncio.run(fetch_concurrently(url))
+            assert all(
+                response.status_code == HTTPStatus.OK
+                for response in responses
+            ), f"Убедитесь, что страница `{url}` доступна под ASGI."
+            timings.setdefault(url, {})[mode] = elapsed
+
+    with capsys.disabled():
+        print(
+            f"\n{CONCURRENT_REQUESTS} одновременных ASGI-запросов, "
+            "мс: синхронные -> асинхронные представления"
+        )
+        for url, timing in timings.items():
+            print(
+                f"{url:32} {timing['sync'] * 1000:8.1f} -> "
+                f"{timing['async'] * 1000:8.1f}"
+            )
+    assert sum(timing["async"] for timing in timings.values()) < sum(
+        timing["sync"] for timing in timings.values()
+    ) * 0.75, (
+        "Убедитесь, что асинхронные представления обрабатывают "
+        "одновременные запросы быстрее синхронных."
+    )
+
+
+def test_async_view_under_wsgi(
+        post_with_published_location, async_routes, client
+):
+    async_routes()
+    response = client.get(f"/posts/{post_with_published_location.id}/")
+    assert response.status_code == HTTPStatus.OK
+    assert post_with_published_location.title in response.content.decode(), (
+        "Убедитесь, что асинхронные представления работают и под WSGI."
+    )
+
+
+def test_async_views_chosen_from_settings(settings):
+    from blog import urls
+
+    settings.ASYNC_VIEWS = {"blog:index"}
+    try:
+        patterns = {
+            pattern.name: pattern.callback
+            for pattern in importlib.reload(urls).urlpatterns
+        }
+    finally:
+        settings.ASYNC_VIEWS = set()
+        importlib.reload(urls)
+    assert asyncio.iscoroutinefunction(patterns["index"]), (
+        "Убедитесь, что маршруты из ASYNC_VIEWS обслуживаются "
+        "асинхронными представлениями."
+    )
+    assert not asyncio.iscoroutinefunction(patterns["post_detail"])
@@ -0,0 +1,268 @@
+import importlib
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, List, Tuple, Type
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.db.models import Model
+from django.test import override_settings
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+FULL_SCALE = {"users": 3000, "posts": 100_000, "comments": 1_000_000}
+SCALE = float(os.environ.get("BLOGICUM_BENCHMARK_SCALE", "0.01"))
+SAMPLES = int(os.environ.get("BLOGICUM_BENCHMARK_SAMPLES", "20"))
+BATCH_SIZE = 5000
+BUDGETS_PATH = Path(__file__).parent / "benchmark_budgets.json"
+RELOGIN_ROUTES = {"logout"}
+ROUTE_QUERIES = {"blog:search": "q={search_query}"}
+
+
+def scaled(name: str) -> int:
+    return max(int(FULL_SCALE[name] * SCALE), 10)
+
+
+def bulk_blend(mixer: Mixer, model: Type[Model], n: int, **values) -> None:
+    with mixer.ctx(commit=False):
+        for start in range(0, n, BATCH_SIZE):
+            model.objects.bulk_create(
+                mixer.cycle(min(BATCH_SIZE, n - start)).blend(model, **values)
+            )
+
+
+@pytest.fixture
+def benchmark_data(mixer: Mixer, CommentModel):
+    from blog.models import Category, Location, Post, recount_comments
+    from blog.search import rebuild_search_index
+
+    User = get_user_model()
+    n_users, n_posts = scaled("users"), scaled("posts")
+    n_comments = scaled("comments")
+    bulk_blend(mixer, User, n_users, username=mixer.sequence("user_{0}"))
+    users = list(User.objects.values_list("id", flat=True))
+    categories = mixer.cycle(10).blend(Category, is_published=True)
+    locations = mixer.cycle(10).blend(Location, is_published=True)
+
+    now = timezone.now()
+    bulk_blend(
+        mixer,
+        Post,
+        n_posts,
+        author_id=mixer.sequence(*users),
+        category=mixer.sequence(*categories),
+        location=mixer.sequence(*locations),
+        is_published=True,
+        pub_date=(now - timedelta(minutes=i) for i in range(n_posts)),
+        image="",
+    )
+    posts = list(Post.objects.values_list("id", flat=True))
+    texts = [mixer.faker.text() for _ in range(100)]
+    for start in range(0, n_comments, BATCH_SIZE):
+        CommentModel.objects.bulk_create(
+            CommentModel(
+                post_id=posts[i % len(posts)],
+                author_id=users[i % len(users)],
+                text=texts[i % len(texts)],
+            )
+            for i in range(start, min(start + BATCH_SIZE, n_comments))
+        )
+    recount_comments()
+    rebuild_search_index()
+
+    author = User.objects.get(id=users[0])
+    post = Post.objects.filter(author=author).first()
+    comment = CommentModel.objects.create(
+        post=post, author=author, text="Комментарий автора"
+    )
+    return {
+        "user": author,
+        "post_id": post.id,
+        "comment_id": comment.id,
+        "category_slug": categories[0].slug,
+        "location_id": locations[0].id,
+        "username": author.username,
+        "uidb64": urlsafe_base64_encode(force_bytes(author.pk)),
+        "search_query": post.title.split()[0],
+        "section": "posts",
+        "number": 1,
+    }
+
+
+def iter_routes(patterns, namespace=""):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(
+                pattern.url_patterns,
+                f"{namespace}{pattern.namespace}:" if pattern.namespace
+                else namespace,
+            )
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield f"{namespace}{pattern.name}", list(
+                pattern.pattern.converters
+                or pattern.pattern.regex.groupindex
+            )
+
+
+def get_routes() -> Dict[str, List[str]]:
+    from api import urls as api_urls
+    from blog import urls as blog_urls
+    from pages import urls as pages_urls
+    from users import urls as users_urls
+
+    routes = {}
+    for module, namespace in (
+            (api_urls, "api:"), (blog_urls, "blog:"), (pages_urls, "pages:"),
+            (users_urls, ""),
+    ):
+        routes.update(iter_routes(module.urlpatterns, namespace))
+    return routes
+
+
+def fetch(client: Client, url: str) -> None:
+    response = client.get(url)
+    if response.streaming:
+        b"".join(response.streaming_content)
+
+
+def measure(client: Client, url: str, relogin=None) -> Tuple[int, float]:
+    if relogin:
+        relogin()
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        fetch(client, url)
+        elapsed = time.perf_counter() - start
+    return len(queries), elapsed * 1000
+
+
+def measure_peak_memory(client: Client, url: str, relogin=None) -> int:
+    if relogin:
+        relogin()
+    tracemalloc.start()
+    try:
+        fetch(client, url)
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+
+def test_routes_within_budget(benchmark_data, capsys):
+    budgets = json.loads(BUDGETS_PATH.read_text())
+    client = Client()
+    client.force_login(benchmark_data["user"])
+    report, failures = [], []
+
+    for name, kwarg_names in sorted(get_routes().items()):
+        # Каждый вход обновляет last_login, поэтому токен сброса пароля
+        # выписывается заново перед каждым маршрутом.
+        benchmark_data["token"] = default_token_generator.make_token(
+            benchmark_data["user"]
+        )
+        url = reverse(name, kwargs={
+            kwarg: benchmark_data[kwarg] for kwarg in kwarg_names
+        })
+        if name in ROUTE_QUERIES:
+            url += "?" + ROUTE_QUERIES[name].format(**benchmark_data)
+        relogin = (
+            (lambda: client.force_login(benchmark_data["user"]))
+            if name in RELOGIN_ROUTES else None
+        )
+        fetch(client, url)
+        samples = [measure(client, url, relogin) for _ in range(SAMPLES)]
+        queries = max(sample[0] for sample in samples)
+        latencies = [sample[1] for sample in samples]
+        p50 = statistics.median(latencies)
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        peak = measure_peak_memory(client, url, relogin)
+        if relogin:
+            relogin()
+        report.append(
+            f"{name:32} {queries:4d} q {p50:8.1f} ms p50 {p95:8.1f} ms p95"
+            f" {peak:8d} KiB"
+        )
+        budget = budgets.get(name)
+        if budget is None:
+            failures.append(f"{name}: нет бюджета в {BUDGETS_PATH.name}")
+            continue
+        for metric, value in (
+                ("queries", queries), ("p95_ms", p95), ("peak_kib", peak)
+        ):
+            if value > budget[metric]:
+                failures.append(
+                    f"{name}: {metric} = {value:.0f} > {budget[metric]}"
+                )
+
+    with capsys.disabled():
+        print(
+            f"\nМасштаб {SCALE}: {scaled('users')} пользователей,"
+            f" {scaled('posts')} публикаций,"
+            f" {scaled('comments')} комментариев"
+        )
+        print("\n".join(report))
+    assert not failures, (
+        "Маршруты превысили бюджет производительности:\n"
+        + "\n".join(failures)
+    )
+
+
+def requests_per_second(client: Client, url: str, count: int = 5) -> float:
+    assert client.get(url).status_code == HTTPStatus.OK
+    start = time.perf_counter()
+    for _ in range(count):
+        client.get(url)
+    return count / (time.perf_counter() - start)
+
+
+def test_production_settings_throughput(benchmark_data, monkeypatch, capsys):
+    """Report only: wall-clock rates are too noisy to assert on."""
+    monkeypatch.setenv("DJANGO_SECRET_KEY", "benchmark")
+    monkeypatch.setenv("DJANGO_ALLOWED_HOSTS", "testserver")
+    monkeypatch.setenv("DJANGO_CACHE_LOCATION", "127.0.0.1:11211")
+    production = importlib.reload(
+        importlib.import_module("blogicum.settings_production")
+    )
+    profiles = {
+        "before": override_settings(
+            DEBUG=True, MIDDLEWARE=production.MIDDLEWARE
+        ),
+        "after": override_settings(
+            DEBUG=False,
+            TEMPLATES=production.TEMPLATES,
+            MIDDLEWARE=production.MIDDLEWARE,
+        ),
+    }
+    clients = {}
+    for key, profile in profiles.items():
+        with profile:
+            clients[key] = Client()
+            clients[key].force_login(benchmark_data["user"])
+    results = {}
+    for url in ("/", f"/posts/{benchmark_data['post_id']}/"):
+        rounds = {key: [] for key in profiles}
+        for _ in range(3):
+            for key, profile in profiles.items():
+                with profile:
+                    rounds[key].append(
+                        requests_per_second(clients[key], url)
+                    )
+        results[url] = [statistics.median(rounds[key]) for key in rounds]
+
+    with capsys.disabled():
+        print("\nЗапросов в секунду: настройки разработки -> production")
+        for url, (before, after) in results.items():
+            print(f"{url:32} {before:8.1f} -> {after:8.1f}")
@@ -0,0 +1,60 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def refresh_count(post):
+    post.refresh_from_db(fields=["comment_count"])
+    return post.comment_count
+
+
+def test_comment_count_follows_views(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert refresh_count(post) == 0
+    for text in ("Первый", "Второй"):
+        response = user_client.post(
+            f"/posts/{post.id}/comment/", data={"text": text}
+        )
+        assert response.status_code == HTTPStatus.FOUND
+    assert refresh_count(post) == 2, (
+        "Убедитесь, что при добавлении комментария увеличивается "
+        "сохранённое количество комментариев публикации."
+    )
+
+    comment = post.comments.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}")
+    assert refresh_count(post) == 1, (
+        "Убедитесь, что при удалении комментария уменьшается "
+        "сохранённое количество комментариев публикации."
+    )
+
+
+def test_comment_count_follows_orm(
+        mixer, post_with_published_location, post_of_another_author,
+        CommentModel
+):
+    post, another_post = post_with_published_location, post_of_another_author
+    comments = mixer.cycle(3).blend(CommentModel, post=post)
+    assert refresh_count(post) == 3
+
+    comments[0].post = another_post
+    comments[0].save()
+    assert (refresh_count(post), refresh_count(another_post)) == (2, 1)
+
+    CommentModel.objects.filter(post=post).delete()
+    assert refresh_count(post) == 0
+
+
+def test_recount_comments_command(
+        mixer, post_with_published_location, CommentModel, PostModel
+):
+    post = post_with_published_location
+    mixer.cycle(4).blend(CommentModel, post=post)
+    PostModel.objects.update(comment_count=0)
+    call_command("recount_comments")
+    assert refresh_count(post) == 4
@@ -0,0 +1,57 @@
+import re
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+COMMENTS_PER_PAGE = 20
+
+
+def test_comments_loaded_page_by_page(
+        mixer, client, post_with_published_location, CommentModel
+):
+    post = post_with_published_location
+    comments = mixer.cycle(45).blend(CommentModel, post=post)
+    expected = [comment.id for comment in sorted(
+        comments, key=lambda comment: (comment.created_at, comment.id)
+    )]
+
+    response = client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    assert len(page) == COMMENTS_PER_PAGE, (
+        "Убедитесь, что на странице публикации комментарии выводятся "
+        "постранично."
+    )
+    loaded = [comment.id for comment in page]
+    more_url = re.search(
+        r'data-comments-more="([^"]+)"', response.content.decode()
+    ).group(1).replace("&amp;", "&")
+    while more_url:
+        fragment = client.get(more_url)
+        assert fragment.status_code == HTTPStatus.OK
+        loaded.extend(comment.id for comment in fragment.context["comments"])
+        match = re.search(
+            r'data-comments-more="([^"]+)"', fragment.content.decode()
+        )
+        more_url = match and match.group(1).replace("&amp;", "&")
+    assert loaded == expected, (
+        "Убедитесь, что подгрузка комментариев возвращает все комментарии "
+        "по порядку без повторов."
+    )
+
+
+def test_comments_fragment_respects_visibility(
+        mixer, user_client, another_user_client, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    url = f"/posts/{post.id}/comments/"
+    assert user_client.get(url).status_code == HTTPStatus.OK
+    assert another_user_client.get(url).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+
+from conftest import run_in_another_process
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize("page", ["index", "category", "profile", "detail"])
+def test_conditional_get(
+        user_client, another_user_client, post_with_published_location,
+        page_urls, page
+):
+    url = page_urls[page]
+    response = user_client.get(url)
+    assert response.has_header("ETag") and response.has_header(
+        "Last-Modified"
+    ), "Убедитесь, что страница отдаёт заголовки `ETag` и `Last-Modified`."
+
+    revalidated = user_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что при совпадении `If-None-Match` возвращается 304."
+    )
+    assert revalidated.context is None
+    revalidated = user_client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    )
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+
+    other = another_user_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert other.status_code == HTTPStatus.OK, (
+        "Убедитесь, что `ETag` различается для разных пользователей."
+    )
+
+    user_client.post(
+        f"/posts/{post_with_published_location.id}/comment/",
+        data={"text": "Новый комментарий"},
+    )
+    changed = user_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert changed.status_code == HTTPStatus.OK, (
+        "Убедитесь, что `ETag` меняется после изменения комментариев."
+    )
+
+
+@pytest.mark.usefixtures("shared_cache")
+@pytest.mark.parametrize("url", ["/", "/posts/{post.id}/", "/rss/"])
+def test_validators_change_after_edit_in_another_process(
+        client, post_with_published_location, url
+):
+    post = post_with_published_location
+    url = url.format(post=post)
+    etag = client.get(url)["ETag"]
+    run_in_another_process(
+        "from blog.cache import (\n"
+        "    FEED_SCOPE, SYNDICATION_SCOPE, bump_versions, post_scope)\n"
+        f"bump_versions(FEED_SCOPE, SYNDICATION_SCOPE, post_scope({post.id}))"
+    )
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после изменения в другом процессе `ETag` меняется "
+        "и страница не отдаётся как неизменившаяся."
+    )
+
+
+def test_etag_changes_after_login_again(
+        user, user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = user_client.get(url)["ETag"]
+    user_client.logout()
+    user_client.force_login(user)
+    assert user_client.get(
+        url, HTTP_IF_NONE_MATCH=etag
+    ).status_code == HTTPStatus.OK, (
+        "Убедитесь, что после повторного входа страница с формой не "
+        "отдаётся как неизменившаяся: в ней новый CSRF-токен."
+    )
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts_with_equal_pub_dates(mixer, user, published_category):
+    pub_dates = [timezone.now() - timedelta(days=day % 4 + 1) for day in range(25)]
+    return mixer.cycle(len(pub_dates)).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(pub_date for pub_date in pub_dates),
+        title=mixer.sequence(*(f"Пост {i % 3}" for i in range(25))),
+    )
+
+
+def walk_pages(client, url, direction="next"):
+    pages, cursor = [], None
+    while True:
+        response = client.get(url, {"cursor": cursor} if cursor else {})
+        assert response.status_code == HTTPStatus.OK
+        page = response.context["page_obj"]
+        pages.append([post.id for post in page])
+        cursor = getattr(page, f"{direction}_cursor")
+        if cursor is None:
+            return pages, page
+
+
+@override_settings(POSTS_CURSOR_PAGINATION=True)
+@pytest.mark.parametrize("url_name", ["index", "category", "profile"])
+def test_cursor_pages_follow_model_ordering(
+        user_client, user, published_category, posts_with_equal_pub_dates,
+        PostModel, url_name
+):
+    url = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[url_name]
+    expected = list(
+        PostModel.objects.order_by("-pub_date", "title", "id")
+        .values_list("id", flat=True)
+    )
+    pages, last_page = walk_pages(user_client, url)
+    assert [post_id for page in pages for post_id in page] == expected, (
+        "Убедитесь, что при постраничной навигации по курсору публикации "
+        "выводятся без пропусков и повторов в порядке `-pub_date, title`."
+    )
+    assert all(len(page) == N_PER_PAGE for page in pages[:-1])
+
+    response = user_client.get(url, {"cursor": last_page.previous_cursor})
+    assert [post.id for post in response.context["page_obj"]] == pages[-2], (
+        "Убедитесь, что ссылка на предыдущую страницу возвращает ту же "
+        "страницу, с которой был выполнен переход."
+    )
+
+
+@override_settings(POSTS_CURSOR_PAGINATION=True)
+def test_cursor_pages_skip_count_query(
+        user_client, posts_with_equal_pub_dates, django_assert_num_queries
+):
+    user_client.get("/")
+    with django_assert_num_queries(1) as captured:
+        response = user_client.get("/", {"cursor": "не курсор"})
+    assert response.status_code == HTTPStatus.OK
+    assert not any(
+        "COUNT(*)" in query["sql"] for query in captured.captured_queries
+    ), "Убедитесь, что постраничная навигация по курсору не выполняет COUNT."
@@ -0,0 +1,100 @@
+import csv
+import gzip
+import json
+from io import StringIO
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_export_jsonl(tmp_path, many_posts_with_published_locations, comment):
+    call_command("export_blog", str(tmp_path), stdout=StringIO())
+    posts = read_jsonl(tmp_path / "posts.jsonl")
+    assert sorted(post["id"] for post in posts) == sorted(
+        post.id for post in
+        [*many_posts_with_published_locations, comment.post]
+    ), "Убедитесь, что export_blog выгружает все публикации."
+    assert [row["id"] for row in read_jsonl(tmp_path / "comments.jsonl")] == [
+        comment.id
+    ]
+    authors = read_jsonl(tmp_path / "authors.jsonl")
+    assert authors and all("password" not in author for author in authors), (
+        "Убедитесь, что export_blog не выгружает пароли пользователей."
+    )
+    for name in ("categories", "locations"):
+        assert (tmp_path / f"{name}.jsonl").exists()
+
+
+def test_export_csv_gzip(tmp_path, post_with_published_location):
+    call_command(
+        "export_blog", str(tmp_path), "--format", "csv", "--gzip",
+        "--tables", "posts", stdout=StringIO(),
+    )
+    with gzip.open(tmp_path / "posts.csv.gz", "rt", newline="") as stream:
+        rows = list(csv.DictReader(stream))
+    assert [row["title"] for row in rows] == [
+        post_with_published_location.title
+    ], "Убедитесь, что export_blog умеет выгружать CSV со сжатием gzip."
+    assert rows[0]["pub_date"] == (
+        post_with_published_location.pub_date.isoformat()
+    )
+
+
+def test_export_since(tmp_path, many_posts_with_published_locations):
+    from blog.models import Post
+
+    old, *recent = many_posts_with_published_locations
+    Post.objects.filter(pk=old.pk).update(
+        updated_at=timezone.now() - timedelta(days=10)
+    )
+    since = (timezone.now() - timedelta(days=1)).isoformat()
+    call_command(
+        "export_blog", str(tmp_path), "--since", since,
+        stdout=StringIO(),
+    )
+    ids = {post["id"] for post in read_jsonl(tmp_path / "posts.jsonl")}
+    assert ids == {post.id for post in recent}, (
+        "Убедитесь, что с --since выгружаются только изменённые публикации."
+    )
+
+
+def test_export_since_limits(tmp_path, mixer, user, published_category):
+    from blog.models import Category
+
+    old = timezone.now() - timedelta(days=10)
+    Category.objects.filter(pk=published_category.pk).update(
+        created_at=old, updated_at=old
+    )
+    users = type(user).objects.filter(pk=user.pk)
+    users.update(date_joined=old)
+    deleted = mixer.blend("blog.Category")
+    Category.objects.filter(pk=deleted.pk).update(
+        created_at=old, updated_at=old
+    )
+    since = (timezone.now() - timedelta(days=1)).isoformat()
+
+    published_category.title = "Новое название"
+    published_category.save()
+    users.update(first_name="Новое имя")
+    deleted.delete()
+    call_command(
+        "export_blog", str(tmp_path), "--since", since,
+        "--tables", "authors", "categories", stdout=StringIO(),
+    )
+    assert [row["title"] for row in read_jsonl(
+        tmp_path / "categories.jsonl"
+    )] == ["Новое название"], (
+        "Убедитесь, что с --since выгружаются изменённые категории."
+    )
+    assert read_jsonl(tmp_path / "authors.jsonl") == [], (
+        "Изменения профилей авторов не попадают в выгрузку с --since: "
+        "у пользователей нет времени изменения."
+    )
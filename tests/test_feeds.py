@@ -0,0 +1,131 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(post_with_published_location):
+    return post_with_published_location
+
+
+@pytest.fixture
+def unpublished_post(mixer, post):
+    return mixer.blend(
+        "blog.Post", is_published=False, category=post.category,
+        author=post.author
+    )
+
+
+@pytest.fixture
+def feed_urls(post):
+    return (
+        "/rss/",
+        "/atom/",
+        f"/category/{post.category.slug}/rss/",
+        f"/category/{post.category.slug}/atom/",
+        f"/profile/{post.author.username}/rss/",
+        f"/profile/{post.author.username}/atom/",
+    )
+
+
+def test_feeds_list_published_posts(
+        post, feed_urls, unpublished_post, client
+):
+    for url in feed_urls:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        content = response.content.decode()
+        assert post.title in content, (
+            f"Убедитесь, что лента `{url}` содержит опубликованные посты."
+        )
+        assert unpublished_post.title not in content, (
+            f"Убедитесь, что лента `{url}` не содержит неопубликованных "
+            "постов."
+        )
+
+
+def test_category_feed_lists_only_category_posts(
+        post, mixer, another_category, client
+):
+    other = mixer.blend(
+        "blog.Post", category=another_category, author=post.author
+    )
+    content = client.get(f"/category/{post.category.slug}/rss/").content
+    assert post.title in content.decode()
+    assert other.title not in content.decode(), (
+        "Убедитесь, что лента категории содержит только её публикации."
+    )
+
+
+def test_feed_conditional_get(post, client):
+    response = client.get("/rss/")
+    with CaptureQueriesContext(connection) as queries:
+        not_modified = client.get(
+            "/rss/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что лента отвечает 304 на запрос с актуальным ETag."
+    )
+    assert len(queries) <= 1
+    with CaptureQueriesContext(connection) as queries:
+        cached = client.get("/rss/")
+    assert cached.content == response.content
+    assert len(queries) <= 1, (
+        "Убедитесь, что неизменившаяся лента отдаётся из кэша, "
+        "а не формируется заново."
+    )
+
+
+def test_feed_changes_only_with_posts(post, user_client, client):
+    etag = client.get("/rss/")["ETag"]
+    user_client.post(
+        f"/posts/{post.id}/comment/", {"text": "Комментарий"}
+    )
+    assert client.get("/rss/")["ETag"] == etag, (
+        "Убедитесь, что комментарии не сбрасывают кэш ленты."
+    )
+    post.title = "Новый заголовок"
+    post.save()
+    response = client.get("/rss/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert "Новый заголовок" in response.content.decode(), (
+        "Убедитесь, что после изменения публикации лента обновляется."
+    )
+
+
+def test_feed_last_modified_follows_site_changes(post, client):
+    from blog.models import Post
+
+    week_ago = timezone.now() - timedelta(days=7)
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=week_ago, updated_at=week_ago
+    )
+    post.category.description = "Новое описание"
+    post.category.save()
+    response = client.get("/rss/")
+    assert client.get(
+        "/rss/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    ).status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что Last-Modified ленты совпадает с датой, по которой "
+        "проверяется If-Modified-Since."
+    )
+
+
+def test_feed_cache_shared_by_users_and_queries(post, user_client, client):
+    response = client.get("/rss/")
+    for other_client, url in ((user_client, "/rss/"), (client, "/rss/?a=1")):
+        with CaptureQueriesContext(connection) as queries:
+            cached = other_client.get(url)
+        assert cached.content == response.content
+        assert len([
+            query for query in queries if "blog_post" in query["sql"]
+        ]) <= 1, (
+            "Убедитесь, что кэш ленты не зависит от пользователя и "
+            "параметров запроса."
+        )
@@ -0,0 +1,112 @@
+import hashlib
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.utils import timezone
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def make_image(size=(200, 100)):
+    output = BytesIO()
+    Image.new("RGB", size, (73, 109, 137)).save(output, "PNG")
+    return output.getvalue()
+
+
+@pytest.fixture
+def create_post(user_client, published_category):
+    def create(content, client=user_client):
+        return client.post("/posts/create/", {
+            "title": "Публикация с картинкой",
+            "text": "Текст",
+            "pub_date": timezone.now().strftime("%Y-%m-%d %H:%M"),
+            "category": published_category.id,
+            "image": SimpleUploadedFile("image.png", content),
+        })
+    return create
+
+
+def stored_images(media_root):
+    return list((media_root / "posts_images").rglob("*.png"))
+
+
+def test_upload_hashed_while_streaming(create_post, PostModel, media_root):
+    content = make_image()
+    response = create_post(content)
+    assert response.status_code == HTTPStatus.FOUND
+    post = PostModel.objects.get()
+    assert post.image_hash == hashlib.sha256(content).hexdigest(), (
+        "Убедитесь, что при загрузке изображения сохраняется хеш его "
+        "содержимого."
+    )
+    assert len(stored_images(media_root)) == 1
+
+
+@pytest.mark.parametrize("limit, value", [
+    ("POST_IMAGE_MAX_BYTES", 100),
+    ("POST_IMAGE_MAX_PIXELS", 1000),
+])
+def test_upload_over_limit_rejected(
+        settings, create_post, PostModel, media_root, limit, value
+):
+    setattr(settings, limit, value)
+    response = create_post(make_image())
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["form"].errors.get("image"), (
+        "Убедитесь, что изображение сверх допустимого размера или "
+        "количества пикселей отклоняется с ошибкой в поле формы."
+    )
+    assert not PostModel.objects.exists()
+    assert not stored_images(media_root), (
+        "Убедитесь, что отклонённое изображение не сохраняется на диск."
+    )
+
+
+def pad_jpeg_header(content, size):
+    """Insert APP15 segments between SOI and the frame header."""
+    segment = b"\xff\xef" + (0xFFFF).to_bytes(2, "big") + b"\0" * 0xFFFD
+    return content[:2] + segment * (size // len(segment) + 1) + content[2:]
+
+
+def test_upload_with_unreadable_header_rejected(
+        settings, create_post, PostModel, media_root
+):
+    settings.POST_IMAGE_MAX_PIXELS = 1000
+    output = BytesIO()
+    Image.new("RGB", (200, 100)).save(output, "JPEG")
+    response = create_post(pad_jpeg_header(output.getvalue(), 600 * 1024))
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["form"].errors.get("image"), (
+        "Убедитесь, что изображение, размеры которого не удаётся прочитать "
+        "из начала файла, отклоняется, а не принимается без проверки."
+    )
+    assert not PostModel.objects.exists()
+
+
+def test_identical_uploads_share_file(create_post, PostModel, media_root):
+    content = make_image()
+    create_post(content)
+    create_post(content)
+    first, second = PostModel.objects.order_by("id")
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что повторно загруженное изображение не сохраняется "
+        "второй раз, а используется уже сохранённый файл."
+    )
+    assert len(stored_images(media_root)) == 1
+    create_post(make_image((100, 200)))
+    assert len(stored_images(media_root)) == 2
+
+
+def test_upload_keeps_csrf_protection(user, create_post, PostModel):
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = create_post(make_image(), client=client)
+    assert response.status_code == HTTPStatus.FORBIDDEN, (
+        "Убедитесь, что страница создания публикации по-прежнему "
+        "проверяет CSRF-токен."
+    )
+    assert not PostModel.objects.exists()
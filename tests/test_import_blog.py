@@ -0,0 +1,142 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def exported(tmp_path, mixer, many_posts_with_published_locations):
+    from blog.models import Post
+
+    post = many_posts_with_published_locations[0]
+    Post.objects.filter(pk=post.pk).update(title="Импортированный пингвин")
+    mixer.cycle(3).blend("blog.Comments", post=post, author=post.author)
+
+    def export(*args):
+        call_command("export_blog", str(tmp_path), *args, stdout=StringIO())
+        return tmp_path
+
+    return export
+
+
+def clear_blog():
+    from blog.models import Category, Location, Post, User
+
+    Post.objects.all().delete()
+    Category.objects.all().delete()
+    Location.objects.all().delete()
+    User.objects.all().delete()
+
+
+def snapshot():
+    from blog.models import Comments, Post
+
+    return (
+        sorted(Post.objects.values_list(
+            "title", "author__username", "category__slug", "location__name",
+            "pub_date", "created_at", "comment_count",
+        )),
+        sorted(Comments.objects.values_list(
+            "text", "post__title", "author__username", "created_at",
+        )),
+    )
+
+
+@pytest.mark.parametrize("options", ((), ("--format", "csv", "--gzip")))
+def test_import_round_trip(exported, options):
+    from blog.search import search_post_ids
+
+    directory = exported(*options)
+    before = snapshot()
+    clear_blog()
+    output = StringIO()
+    call_command("import_blog", str(directory), stdout=output)
+    assert snapshot() == before, (
+        "Убедитесь, что import_blog восстанавливает публикации, "
+        "комментарии, их связи, даты и счётчики комментариев."
+    )
+    assert len(search_post_ids("пингвин")) == 1, (
+        "Убедитесь, что после импорта перестраивается поисковый индекс."
+    )
+    assert "строк/с" in output.getvalue()
+
+
+def test_import_reuses_existing_rows(exported):
+    from blog.models import Category, Post, User
+
+    directory = exported()
+    posts = Post.objects.count()
+    users = User.objects.count()
+    categories = Category.objects.count()
+    call_command("import_blog", str(directory), stdout=StringIO())
+    assert (User.objects.count(), Category.objects.count()) == (
+        users, categories
+    ), (
+        "Убедитесь, что import_blog сопоставляет авторов и категории "
+        "с уже существующими по имени пользователя и слагу."
+    )
+    assert Post.objects.count() == posts * 2, (
+        "Публикации и комментарии не имеют естественного ключа, поэтому "
+        "повторная загрузка добавляет их заново."
+    )
+
+
+def test_imported_authors_cannot_log_in(exported):
+    from blog.models import User
+
+    directory = exported("--tables", "authors")
+    clear_blog()
+    call_command("import_blog", str(directory), stdout=StringIO())
+    assert User.objects.exists()
+    assert not any(user.has_usable_password() for user in User.objects.all())
+
+
+def test_failed_import_rolled_back(exported):
+    from blog.models import Post
+
+    directory = exported()
+    with (directory / "comments.jsonl").open("a") as stream:
+        stream.write("{не json\n")
+    clear_blog()
+    with pytest.raises(ValueError):
+        call_command("import_blog", str(directory), stdout=StringIO())
+    assert not Post.objects.exists(), (
+        "Убедитесь, что import_blog не оставляет частично загруженных "
+        "данных, если загрузка прервалась."
+    )
+
+
+def test_postgresql_tables_locked(monkeypatch):
+    from blog.management.commands import import_blog
+    from blog.models import Category, Post
+
+    executed = []
+
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def execute(self, sql):
+            executed.append(sql)
+
+    class PostgreSQL:
+        vendor = "postgresql"
+        ops = connection.ops
+
+        def cursor(self):
+            return Cursor()
+
+    monkeypatch.setattr(import_blog, "connection", PostgreSQL())
+    import_blog.lock_tables([Category, Post])
+    assert executed == [
+        'LOCK TABLE "blog_category", "blog_post" IN EXCLUSIVE MODE'
+    ], (
+        "Убедитесь, что в PostgreSQL import_blog блокирует таблицы, "
+        "в которые добавляет строки с выбранными заранее id."
+    )
@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.jobs import TASKS, claim_job, enqueue, run_pending_jobs
+from blog.models import Job
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def calls():
+    calls = []
+
+    def record(**payload):
+        calls.append(payload)
+
+    def fail(**payload):
+        calls.append(payload)
+        raise ValueError("Ошибка обработки")
+
+    TASKS.update(record=record, fail=fail)
+    yield calls
+    del TASKS["record"], TASKS["fail"]
+
+
+def test_worker_runs_and_removes_jobs(calls):
+    enqueue("record", number=1)
+    enqueue("record", number=2)
+    call_command("run_worker", "--once")
+    assert calls == [{"number": 1}, {"number": 2}], (
+        "Убедитесь, что `run_worker` выполняет задачи в порядке постановки "
+        "в очередь."
+    )
+    assert not Job.objects.exists()
+
+
+def test_job_claimed_once(calls):
+    enqueue("record")
+    job = claim_job()
+    assert job.status == Job.RUNNING
+    assert claim_job() is None, (
+        "Убедитесь, что задачу, взятую в работу, не получит другой "
+        "обработчик."
+    )
+
+
+def test_failed_job_retried_with_backoff(settings, calls):
+    settings.JOB_MAX_ATTEMPTS = 2
+    job = enqueue("fail")
+    assert run_pending_jobs() == 1
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (Job.PENDING, 1)
+    assert job.run_after > timezone.now()
+    assert "Ошибка обработки" in job.error
+    assert run_pending_jobs() == 0, (
+        "Убедитесь, что упавшая задача повторяется не раньше заданной паузы."
+    )
+
+    Job.objects.update(run_after=timezone.now())
+    run_pending_jobs()
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (Job.FAILED, 2), (
+        "Убедитесь, что задача помечается ошибочной после "
+        "`JOB_MAX_ATTEMPTS` попыток."
+    )
+    assert len(calls) == 2
+
+
+def test_stale_running_job_requeued(settings, calls):
+    enqueue("record")
+    claim_job()
+    Job.objects.update(
+        updated_at=timezone.now() - timedelta(
+            seconds=settings.JOB_TIMEOUT + 1
+        )
+    )
+    assert run_pending_jobs() == 1
+    assert calls == [{}]
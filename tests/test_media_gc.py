@@ -0,0 +1,128 @@
+import os
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+
+from blog.models import MediaFile
+from blog.storage import post_image_storage
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def make_upload(color=(73, 109, 137)):
+    output = BytesIO()
+    Image.new("RGB", (64, 48), color).save(output, "JPEG")
+    return SimpleUploadedFile("photo.jpg", output.getvalue())
+
+
+def test_shared_image_released_with_last_reference(blend_post, media_root):
+    first = blend_post(image=make_upload())
+    second = blend_post(image=make_upload())
+    path = media_root / first.image.name
+    assert first.image.name == second.image.name
+    assert MediaFile.objects.get(name=first.image.name).references == 2, (
+        "Убедитесь, что для одинаковых изображений хранится один файл "
+        "и считается количество ссылок на него."
+    )
+    first.delete()
+    second.delete()
+    assert not MediaFile.objects.exists()
+    assert path.exists(), (
+        "Убедитесь, что файл без ссылок не удаляется сразу: его может "
+        "повторно использовать одновременная загрузка."
+    )
+    call_command("gc_media", "--min-age", "0")
+    assert not path.exists(), (
+        "Убедитесь, что `gc_media` удаляет изображение после удаления "
+        "последней публикации, которая на него ссылается."
+    )
+
+
+def test_replaced_image_released(blend_post, media_root):
+    post = blend_post(image=make_upload())
+    old_name = post.image.name
+    post.image = make_upload(color=(0, 0, 0))
+    post.save()
+    assert not MediaFile.objects.filter(name=old_name).exists()
+    old_path = media_root / old_name
+    call_command("gc_media", "--min-age", "0")
+    assert not old_path.exists(), (
+        "Убедитесь, что при замене изображения публикации старый файл "
+        "удаляется, если на него больше нет ссылок."
+    )
+    assert (media_root / post.image.name).exists()
+
+
+def test_reused_image_spared_by_gc(blend_post, media_root):
+    post = blend_post(image=make_upload())
+    path = media_root / post.image.name
+    post.delete()
+    os.utime(path, (0, 0))
+    post_image_storage.save("posts_images/photo.jpg", make_upload())
+    call_command("gc_media")
+    assert path.exists(), (
+        "Убедитесь, что повторно используемый файл не удаляется `gc_media`, "
+        "пока новая ссылка на него не сохранена."
+    )
+
+
+def test_gc_media_removes_orphans(blend_post, media_root):
+    post = blend_post(image=make_upload())
+    call_command("run_worker", "--once")
+    renditions = media_root / "posts_images" / "renditions"
+    kept = {media_root / post.image.name, *renditions.rglob("*.*")}
+    orphan_dir = media_root / "posts_images"
+    orphans = {
+        orphan_dir / "legacy.jpg",
+        renditions / "ff" / ("f" * 64 + "_480w.webp"),
+    }
+    for orphan in orphans:
+        orphan.parent.mkdir(parents=True, exist_ok=True)
+        orphan.write_bytes(b"orphan")
+    MediaFile.objects.update(references=5)
+
+    call_command("gc_media", "--min-age", "0", "--dry-run")
+    assert all(path.exists() for path in kept | orphans), (
+        "Убедитесь, что `gc_media --dry-run` ничего не удаляет."
+    )
+    call_command("gc_media")
+    assert all(path.exists() for path in orphans), (
+        "Убедитесь, что `gc_media` не удаляет файлы моложе `--min-age`."
+    )
+
+    call_command(
+        "gc_media", "--min-age", "0", "--batch-size", "1", "--recount"
+    )
+    assert not any(path.exists() for path in orphans), (
+        "Убедитесь, что `gc_media` удаляет изображения и уменьшенные копии, "
+        "на которые не ссылается ни одна публикация."
+    )
+    assert all(path.exists() for path in kept)
+    assert MediaFile.objects.get(name=post.image.name).references == 1, (
+        "Убедитесь, что `gc_media --recount` пересчитывает ссылки на файлы."
+    )
+
+
+def test_gc_media_reads_reference_counts(blend_post, media_root):
+    post = blend_post(image=make_upload())
+    orphan = media_root / "posts_images" / "00" / ("0" * 64 + ".jpg")
+    orphan.parent.mkdir(parents=True, exist_ok=True)
+    orphan.write_bytes(b"orphan")
+    MediaFile.objects.create(name=f"posts_images/00/{orphan.name}")
+    with CaptureQueriesContext(connection) as queries:
+        call_command("gc_media", "--min-age", "0")
+    assert not orphan.exists(), (
+        "Убедитесь, что `gc_media` удаляет файлы без ссылок по счётчику."
+    )
+    assert (media_root / post.image.name).exists()
+    assert not any(
+        '"blog_post"."image" IN' in query["sql"] for query in queries
+    ), (
+        "Убедитесь, что `gc_media` берёт число ссылок из счётчиков, "
+        "а не перебирает публикации."
+    )
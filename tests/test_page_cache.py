@@ -0,0 +1,83 @@
+import pytest
+from django.test import override_settings
+
+from conftest import run_in_another_process
+
+pytestmark = [pytest.mark.django_db]
+
+
+def update_without_signals(post, **fields):
+    type(post).objects.filter(pk=post.pk).update(**fields)
+
+
+@override_settings(ANONYMOUS_PAGE_CACHE_TIMEOUT=60)
+@pytest.mark.parametrize("page", ["index", "category", "detail"])
+def test_anonymous_pages_are_cached(
+        client, user_client, post_with_published_location, page_urls, page
+):
+    post, url = post_with_published_location, page_urls[page]
+    client.get(url)
+    update_without_signals(post, title="Новый заголовок")
+    assert "Новый заголовок" not in client.get(url).content.decode(), (
+        "Убедитесь, что страница для анонимного посетителя берётся из кэша."
+    )
+    user_client.get(url)
+    assert user_client.get(url).context is not None, (
+        "Убедитесь, что кэш страниц не используется для "
+        "авторизованных пользователей."
+    )
+
+
+@override_settings(ANONYMOUS_PAGE_CACHE_TIMEOUT=60)
+@pytest.mark.parametrize("page", ["index", "category", "detail"])
+def test_anonymous_page_cache_invalidation(
+        client, user_client, mixer, post_with_published_location, page_urls,
+        page
+):
+    post, url = post_with_published_location, page_urls[page]
+    client.get(url)
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in client.get(url).content.decode()
+
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Отзыв"})
+    expected = "Отзыв" if page == "detail" else "Комментарии (1)"
+    assert expected in client.get(url).content.decode(), (
+        "Убедитесь, что кэш страниц сбрасывается при новом комментарии."
+    )
+
+    location = post.location
+    location.name = "Новое место"
+    location.save()
+    assert "Новое место" in client.get(url).content.decode()
+
+
+@override_settings(ANONYMOUS_PAGE_CACHE_TIMEOUT=60)
+def test_session_cookie_bypasses_page_cache(
+        client, post_with_published_location
+):
+    client.get("/")
+    assert client.get("/").context is None
+    client.cookies["sessionid"] = "anonymous-session"
+    assert client.get("/").context is not None
+
+
+@pytest.mark.usefixtures("shared_cache")
+@override_settings(ANONYMOUS_PAGE_CACHE_TIMEOUT=60)
+@pytest.mark.parametrize("page", ["index", "category", "detail"])
+def test_page_cache_invalidated_by_another_process(
+        client, post_with_published_location, page_urls, page
+):
+    post, url = post_with_published_location, page_urls[page]
+    client.get(url)
+    update_without_signals(post, title="Новый заголовок")
+    run_in_another_process(
+        "from blog.cache import (\n"
+        "    FEED_SCOPE, bump_versions, category_scope, post_scope)\n"
+        f"bump_versions(FEED_SCOPE, post_scope({post.id}), "
+        f"category_scope({post.category.slug!r}))"
+    )
+    assert "Новый заголовок" in client.get(url).content.decode(), (
+        "Убедитесь, что изменение, сделанное в другом процессе, "
+        "сбрасывает кэш страниц во всех процессах."
+    )
@@ -0,0 +1,85 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import SystemCheckError
+
+from conftest import run_in_another_process
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_rendered_from_cache(
+        client, post_with_published_location, PostModel
+):
+    post = post_with_published_location
+    client.get("/")
+    PostModel.objects.filter(pk=post.pk).update(text="Не из кэша")
+    content = client.get("/").content.decode()
+    assert "Не из кэша" not in content, (
+        "Убедитесь, что карточки публикаций берутся из кэша."
+    )
+
+
+@pytest.mark.parametrize("change", ["post", "category", "location", "author"])
+def test_post_card_invalidated_on_change(
+        client, post_with_published_location, change
+):
+    post = post_with_published_location
+    client.get("/")
+    target, field = {
+        "post": (post, "title"),
+        "category": (post.category, "title"),
+        "location": (post.location, "name"),
+        "author": (post.author, "username"),
+    }[change]
+    setattr(target, field, "changed_value")
+    target.save()
+    assert "changed_value" in client.get("/").content.decode(), (
+        "Убедитесь, что кэш карточки публикации сбрасывается при изменении "
+        "публикации, её категории, местоположения или автора."
+    )
+
+
+def test_post_card_invalidated_on_comment(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Текст"})
+    assert "Комментарии (1)" in user_client.get("/").content.decode()
+
+
+@pytest.mark.usefixtures("shared_cache")
+def test_cache_versions_shared_between_processes(client):
+    from blog.cache import FEED_SCOPE, get_versions
+
+    before = get_versions(FEED_SCOPE)
+    run_in_another_process(
+        "from blog.cache import FEED_SCOPE, bump_versions\n"
+        "bump_versions(FEED_SCOPE)"
+    )
+    assert get_versions(FEED_SCOPE) != before, (
+        "Убедитесь, что версии кэша хранятся в общем для всех процессов "
+        "кэше, а не в памяти процесса."
+    )
+
+
+def test_process_local_cache_refused(settings):
+    settings.CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }}
+    with pytest.raises(SystemCheckError, match="blog.E001"):
+        call_command("check")
+
+
+def test_dummy_cache_only_warned_about(settings):
+    settings.CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    }}
+    output = StringIO()
+    call_command("check", stderr=output)
+    assert "blog.W001" in output.getvalue(), (
+        "Убедитесь, что выключенный кэш допустим, но вызывает "
+        "предупреждение."
+    )
@@ -0,0 +1,36 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+DETAIL_PAGE_QUERIES = 3
+
+
+@pytest.mark.parametrize("n_comments", [1, 10, 50])
+def test_post_detail_query_count(
+        mixer, user_client, post_with_published_location, CommentModel,
+        django_assert_num_queries, n_comments
+):
+    post = post_with_published_location
+    mixer.cycle(n_comments).blend(CommentModel, post=post)
+    with django_assert_num_queries(DETAIL_PAGE_QUERIES):
+        response = user_client.get(f"/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context["comments"]) == min(n_comments, 20)
+
+
+def test_unpublished_post_visible_only_to_author(
+        mixer, user_client, another_user_client, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    url = f"/posts/{post.id}/"
+    assert user_client.get(url).status_code == HTTPStatus.OK
+    assert another_user_client.get(url).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,217 @@
+from io import BytesIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def make_upload(size=(1600, 1200)):
+    output = BytesIO()
+    Image.linear_gradient("L").resize(size).convert("RGB").save(
+        output, "JPEG"
+    )
+    return SimpleUploadedFile(
+        "photo.jpg", output.getvalue(), content_type="image/jpeg"
+    )
+
+
+def run_worker():
+    call_command("run_worker", "--once")
+
+
+@pytest.fixture
+def post_with_large_image(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        image=make_upload(),
+    )
+    run_worker()
+    post.refresh_from_db()
+    return post
+
+
+def get_picture(client, url):
+    soup = BeautifulSoup(client.get(url).content.decode(), "html.parser")
+    return soup.find("picture")
+
+
+def test_placeholder_until_worker_runs(
+        client, mixer, user, published_category, media_root
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        image=make_upload(),
+    )
+    assert not (media_root / "posts_images" / "renditions").exists(), (
+        "Убедитесь, что уменьшенные копии создаются фоновой задачей, "
+        "а не во время запроса."
+    )
+    img = BeautifulSoup(
+        client.get(f"/posts/{post.id}/").content.decode(), "html.parser"
+    ).find("img", src="/static/img/placeholder.svg")
+    assert img is not None, (
+        "Убедитесь, что до обработки изображения выводится заглушка."
+    )
+    run_worker()
+    assert get_picture(client, f"/posts/{post.id}/") is not None, (
+        "Убедитесь, что после обработки изображения кэш страницы "
+        "сбрасывается и выводятся уменьшенные копии."
+    )
+
+
+def test_renditions_rendered_by_worker(post_with_large_image, media_root):
+    renditions = {
+        path.name: Image.open(path).size
+        for path in (media_root / "posts_images" / "renditions").rglob("*.*")
+    }
+    widths = {width for width, _ in renditions.values()}
+    assert widths == {480, 608, 960, 1216}, (
+        "Убедитесь, что при загрузке изображения создаются уменьшенные "
+        "копии для карточки и страницы публикации в плотностях 1x и 2x."
+    )
+    assert {name.rsplit(".", 1)[1] for name in renditions} == {"jpg", "webp"}
+    assert all(
+        height * 4 == width * 3 for width, height in renditions.values()
+    ), "Убедитесь, что уменьшенные копии сохраняют пропорции изображения."
+
+
+@pytest.mark.parametrize("url", ["/", "/posts/{id}/"])
+def test_templates_use_renditions(client, post_with_large_image, url):
+    post = post_with_large_image
+    picture = get_picture(client, url.format(id=post.id))
+    assert picture is not None, (
+        "Убедитесь, что изображение публикации выводится через `<picture>` "
+        "с уменьшенными копиями."
+    )
+    img, source = picture.find("img"), picture.find("source")
+    assert img["loading"] == "lazy"
+    assert source["type"] == "image/webp"
+    assert img["src"] != post.image.url
+    assert len(img["srcset"].split(",")) == 2
+    assert all(
+        "/renditions/" in candidate
+        for candidate in img["srcset"].split(",")
+    )
+
+
+def test_renditions_named_by_content(
+        client, mixer, user, published_category, post_with_large_image,
+        media_root
+):
+    before = set((media_root / "posts_images" / "renditions").rglob("*.*"))
+    post_with_large_image.image.open()
+    copy = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        image=SimpleUploadedFile(
+            "copy.jpg", post_with_large_image.image.read()
+        ),
+    )
+    post_with_large_image.image.close()
+    run_worker()
+    assert copy.image.name == post_with_large_image.image.name
+    assert set(
+        (media_root / "posts_images" / "renditions").rglob("*.*")
+    ) == before, (
+        "Убедитесь, что имена уменьшенных копий строятся по содержимому "
+        "файла и одинаковые изображения не обрабатываются повторно."
+    )
+    assert (
+        get_picture(client, f"/posts/{copy.id}/").find("img")["srcset"]
+        == get_picture(
+            client, f"/posts/{post_with_large_image.id}/"
+        ).find("img")["srcset"]
+    )
+
+
+def test_unreadable_image_falls_back_to_original(
+        client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        image=SimpleUploadedFile("broken.jpg", b"broken"),
+    )
+    run_worker()
+    response = client.get(f"/posts/{post.id}/")
+    soup = BeautifulSoup(response.content.decode(), "html.parser")
+    assert soup.find("picture") is None
+    assert soup.find("img", src=post.image.url), (
+        "Убедитесь, что нечитаемое изображение выводится без уменьшенных "
+        "копий, а страница публикации не падает."
+    )
+
+
+def test_original_resampled_once(
+        mixer, user, published_category, monkeypatch
+):
+    original_size = (1600, 1200)
+    resampled = []
+    thumbnail = Image.Image.thumbnail
+
+    def count_thumbnail(image, *args, **kwargs):
+        resampled.append(image.size)
+        return thumbnail(image, *args, **kwargs)
+
+    monkeypatch.setattr(Image.Image, "thumbnail", count_thumbnail)
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=make_upload(original_size),
+    )
+    run_worker()
+    assert resampled and resampled.count(original_size) <= 1, (
+        "Убедитесь, что исходное изображение уменьшается один раз, а "
+        "меньшие копии получаются из уже уменьшенной."
+    )
+
+
+def test_original_stored_without_metadata(
+        client, mixer, user, published_category
+):
+    from blog.models import MediaFile
+
+    exif = Image.Exif()
+    exif[0x010F] = "Phone"
+    exif[0x0112] = 6
+    output = BytesIO()
+    Image.new("RGB", (400, 300), "red").save(output, "JPEG", exif=exif)
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+        image=SimpleUploadedFile("photo.jpg", output.getvalue()),
+    )
+    upload = post.image.name
+    url = f"/posts/{post.id}/"
+    assert upload not in client.get(url).content.decode(), (
+        "Убедитесь, что необработанное изображение не показывается."
+    )
+    run_worker()
+    post.refresh_from_db()
+    with Image.open(post.image.path) as picture:
+        assert "exif" not in picture.info, (
+            "Убедитесь, что исходное изображение хранится без EXIF."
+        )
+        assert picture.size == (300, 400), (
+            "Убедитесь, что поворот из EXIF применяется к изображению."
+        )
+    assert post.image_renditions["card"]
+    content = client.get(url).content.decode()
+    assert post.image.url in content and upload not in content
+    assert not MediaFile.objects.filter(name=upload).exists(), (
+        "Убедитесь, что на загруженный файл с метаданными не остаётся "
+        "ссылок и его удалит gc_media."
+    )
@@ -0,0 +1,44 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(POSTS_PUBLISH_CUTOFF_GRANULARITY=60)
+def test_scheduled_post_appears_without_restart(
+        user_client, mixer, user, published_category
+):
+    now = timezone.now()
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=now + timedelta(minutes=5),
+    )
+    response = user_client.get("/")
+    assert post not in response.context["page_obj"]
+
+    with mock.patch(
+            "django.utils.timezone.now",
+            return_value=now + timedelta(minutes=7)
+    ):
+        response = user_client.get("/")
+    assert post in response.context["page_obj"], (
+        "Убедитесь, что отложенная публикация появляется на главной странице "
+        "после наступления даты публикации."
+    )
+
+
+@override_settings(POSTS_PUBLISH_CUTOFF_GRANULARITY=60)
+def test_publish_cutoff_is_quantized():
+    from blog.models import get_publish_cutoff
+
+    now = timezone.now().replace(second=30)
+    cutoff = get_publish_cutoff(now)
+    assert cutoff == now.replace(second=0, microsecond=0)
+    assert get_publish_cutoff(now + timedelta(seconds=20)) == cutoff
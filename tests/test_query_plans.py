@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="EXPLAIN QUERY PLAN is SQLite"
+    ),
+]
+
+
+def get_query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def feed_querysets(user, category, post):
+    from blog.models import get_filtered_posts
+    from blog.paginators import CursorPaginator
+
+    index = get_filtered_posts()
+    return {
+        "index": index,
+        "index_cursor": index.order_by(
+            *(("-" if desc else "") + name
+              for name, desc in CursorPaginator(index, 10).ordering)
+        ),
+        "category": get_filtered_posts(posts=category.posts),
+        "profile": get_filtered_posts(posts=user.posts),
+        "own_profile": get_filtered_posts(
+            posts=user.posts, filter_published=False
+        ),
+        "comments": post.comments.select_related("author"),
+    }
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["index", "index_cursor", "category", "profile", "own_profile",
+     "comments"],
+)
+def test_feed_queries_use_indexes(
+        name, user, published_category, post_with_published_location
+):
+    queryset = feed_querysets(
+        user, published_category, post_with_published_location
+    )[name]
+    plan = get_query_plan(queryset[:10])
+    assert not any(step.startswith("SCAN") for step in plan), (
+        f"Запрос `{name}` выполняет полный просмотр таблицы: {plan}"
+    )
+    assert not any("TEMP B-TREE" in step for step in plan), (
+        f"Запрос `{name}` сортирует строки во временном B-дереве: {plan}"
+    )
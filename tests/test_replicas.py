@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, connections, router
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    """Add a 'replica' alias backed by an SQLite file.
+
+    Returns a function that copies the test database into the replica,
+    standing in for replication.
+    """
+    connections.databases["replica"] = {
+        **connection.settings_dict,
+        "NAME": str(tmp_path / "replica.sqlite3"),
+    }
+    settings.REPLICA_DATABASES = ["replica"]
+    settings.REPLICA_LAG = 0
+
+    def sync():
+        connection.ensure_connection()
+        connections["replica"].ensure_connection()
+        connection.connection.backup(connections["replica"].connection)
+
+    sync()
+    yield sync
+    connections["replica"].close()
+    del connections["replica"]
+    del connections.databases["replica"]
+
+
+@pytest.fixture
+def post(post_with_published_location):
+    return post_with_published_location
+
+
+@pytest.mark.parametrize(
+    "url",
+    (
+        "/",
+        "/posts/{post.id}/",
+        "/category/{post.category.slug}/",
+        "/profile/{post.author.username}/",
+    ),
+)
+def test_pages_read_from_replica(replica, post, client, url):
+    replica()
+    url = url.format(post=post)
+    with CaptureQueriesContext(connection) as primary, CaptureQueriesContext(
+        connections["replica"]
+    ) as secondary:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert secondary and not primary, (
+        f"Убедитесь, что страница `{url}` читает данные из реплики."
+    )
+
+
+def test_author_reads_own_comment_after_posting(
+        replica, post, user_client, another_user, client
+):
+    replica()
+    url = f"/posts/{post.id}/"
+    user_client.post(f"{url}comment/", {"text": "Свежий комментарий"})
+    assert "Свежий комментарий" in user_client.get(url).content.decode(), (
+        "Убедитесь, что после отправки комментария автор читает страницы "
+        "из основной базы данных и видит свой комментарий."
+    )
+    client.force_login(another_user)
+    assert "Свежий комментарий" not in client.get(url).content.decode(), (
+        "Убедитесь, что другие пользователи читают страницу публикации "
+        "из реплики."
+    )
+    replica()
+    assert "Свежий комментарий" in client.get(url).content.decode()
+
+
+def test_recent_changes_read_from_default(replica, post, client, settings):
+    settings.REPLICA_LAG = 60
+    replica()
+    post.title = "Новый заголовок"
+    post.save()
+    url = f"/posts/{post.id}/"
+    with CaptureQueriesContext(connections["replica"]) as secondary:
+        response = client.get(url)
+    assert "Новый заголовок" in response.content.decode() and not secondary, (
+        "Убедитесь, что страницы, изменённые позже, чем может отставать "
+        "реплика, читаются из основной базы данных и не попадают в кэш "
+        "устаревшими."
+    )
+
+
+def test_replicas_not_migrated(replica):
+    assert router.allow_migrate("replica", "blog") is False, (
+        "Убедитесь, что миграции не применяются к репликам."
+    )
+    assert router.allow_migrate("default", "blog")
@@ -0,0 +1,134 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from blog.jobs import run_pending_jobs
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def reindex_at_once(settings):
+    settings.SEARCH_REINDEX_DELAY = 0
+
+
+def search(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == HTTPStatus.OK
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_ranks_title_above_text_and_comments(
+        client, mixer, blend_post, CommentModel
+):
+    in_comment = blend_post(title="Прогулка", text="Парк и озеро.")
+    mixer.blend(CommentModel, post=in_comment, text="Видел там цаплю.")
+    run_pending_jobs()
+    in_text = blend_post(title="Заметки", text="У воды стояла цапля.")
+    in_title = blend_post(title="Цапля на озере", text="Птицы.")
+    blend_post(title="Без совпадений", text="Лес.")
+    expected = [in_title.id, in_text.id, in_comment.id]
+    assert search(client, "цапл") == expected, (
+        "Убедитесь, что поиск находит публикации по заголовку, тексту и "
+        "комментариям и выше ставит совпадения в заголовке."
+    )
+
+
+def test_search_respects_visibility(
+        client, blend_post, published_category
+):
+    visible = blend_post(title="Закат")
+    blend_post(title="Закат черновик", is_published=False)
+    blend_post(
+        title="Закат завтра", pub_date=timezone.now() + timedelta(days=1)
+    )
+    published_category.is_published = False
+    published_category.save()
+    assert search(client, "закат") == [], (
+        "Убедитесь, что поиск не показывает публикации из снятых с "
+        "публикации категорий."
+    )
+    published_category.is_published = True
+    published_category.save()
+    assert search(client, "закат") == [visible.id], (
+        "Убедитесь, что поиск не показывает неопубликованные и отложенные "
+        "публикации."
+    )
+
+
+def test_search_index_follows_changes(
+        client, mixer, blend_post, CommentModel
+):
+    post = blend_post(title="Старый заголовок", text="Текст.")
+    post.title = "Новый заголовок"
+    post.save()
+    assert search(client, "старый") == []
+    assert search(client, "новый") == [post.id]
+
+    comment = mixer.blend(CommentModel, post=post, text="Редкое слово.")
+    run_pending_jobs()
+    assert search(client, "редкое") == [post.id]
+    comment.delete()
+    run_pending_jobs()
+    assert search(client, "редкое") == []
+
+    post.delete()
+    assert search(client, "заголовок") == [], (
+        "Убедитесь, что поисковый индекс обновляется при изменении и "
+        "удалении публикаций и комментариев."
+    )
+
+
+def test_search_handles_query_syntax(client, blend_post):
+    post = blend_post(title="Кот")
+    for query in ('кот"', "кот AND OR", "NEAR(кот", "*", ""):
+        response = client.get("/search/", {"q": query})
+        assert response.status_code == HTTPStatus.OK, (
+            "Убедитесь, что служебные символы в поисковом запросе не "
+            "приводят к ошибке."
+        )
+    assert search(client, "кот)") == [post.id]
+
+
+def test_rebuild_search_index_command(client, blend_post):
+    post = blend_post(title="Маяк")
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM blog_post_search")
+    assert search(client, "маяк") == []
+    call_command("rebuild_search_index")
+    assert search(client, "маяк") == [post.id]
+
+
+def test_comment_burst_reindexes_post_once(
+        client, mixer, blend_post, CommentModel, settings
+):
+    from blog.models import Job
+
+    settings.SEARCH_REINDEX_DELAY = 60
+    post = blend_post(title="Обсуждение")
+    mixer.cycle(5).blend(CommentModel, post=post, text="Чайка.")
+    assert Job.objects.filter(task="index_post").count() == 1, (
+        "Убедитесь, что комментарии к одной публикации переиндексируют её "
+        "одной отложенной фоновой задачей."
+    )
+    assert search(client, "чайка") == []
+    Job.objects.update(run_after=timezone.now())
+    run_pending_jobs()
+    assert search(client, "чайка") == [post.id]
+
+
+def test_search_limit_counts_only_visible_posts(
+        client, blend_post, settings
+):
+    settings.SEARCH_RESULTS_LIMIT = 2
+    for _ in range(3):
+        blend_post(title="Маяк, маяк, маяк", is_published=False)
+    visible = blend_post(title="Маяк")
+    assert search(client, "маяк") == [visible.id], (
+        "Убедитесь, что ограничение числа результатов поиска применяется "
+        "после отбора видимых публикаций."
+    )
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from conftest import run_in_another_process
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_index_queries(user):
+    client = Client()
+    client.force_login(user)
+    client.get("/")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/")
+    assert response.status_code == HTTPStatus.OK
+    return len(queries)
+
+
+def test_cached_session_and_user_save_queries(
+        settings, user, many_posts_with_published_locations
+):
+    cached = count_index_queries(user)
+    settings.SESSION_ENGINE = "django.contrib.sessions.backends.db"
+    settings.USER_CACHE_TIMEOUT = 0
+    uncached = count_index_queries(user)
+    assert uncached - cached >= 2, (
+        "Убедитесь, что сессия и пользователь авторизованного запроса "
+        "берутся из кэша, а не из базы данных."
+    )
+
+
+def test_cached_user_follows_changes(user, user_client):
+    user_client.get("/")
+    user.first_name = "Изменённое"
+    user.save()
+    response = user_client.get("/")
+    assert response.wsgi_request.user.first_name == "Изменённое", (
+        "Убедитесь, что после изменения пользователя кэш не возвращает "
+        "устаревшие данные."
+    )
+
+
+def test_password_change_ends_other_sessions(user, user_client):
+    other_client = Client()
+    other_client.force_login(user)
+    other_client.get("/")
+    user.set_password("новый-пароль-123")
+    user.save()
+    response = other_client.get("/")
+    assert not response.wsgi_request.user.is_authenticated, (
+        "Убедитесь, что смена пароля завершает остальные сессии "
+        "пользователя несмотря на кэш."
+    )
+
+
+@pytest.mark.usefixtures("shared_cache")
+def test_deactivation_in_another_process_ends_sessions(user, user_client):
+    user_client.get("/")
+    type(user).objects.filter(pk=user.pk).update(is_active=False)
+    run_in_another_process(
+        "from django.contrib.auth import get_user_model\n"
+        "from django.db.models.signals import post_save\n"
+        "User = get_user_model()\n"
+        "post_save.send(\n"
+        f"    sender=User, instance=User(pk={user.pk}), created=False\n"
+        ")"
+    )
+    response = user_client.get("/")
+    assert not response.wsgi_request.user.is_authenticated, (
+        "Убедитесь, что пользователь, отключённый в другом процессе, "
+        "например командой управления, не остаётся авторизованным из-за "
+        "кэша."
+    )
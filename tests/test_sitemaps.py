@@ -0,0 +1,146 @@
+import asyncio
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+import pytest
+from asgiref.testing import ApplicationCommunicator
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+NAMESPACE = {"sitemap": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+
+
+def get_xml(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что карта сайта `{url}` доступна."
+    )
+    content = (
+        b"".join(response.streaming_content) if response.streaming
+        else response.content
+    )
+    return ElementTree.fromstring(content)
+
+
+def get_locations(tree):
+    return [
+        location.text.replace("http://testserver", "")
+        for location in tree.iterfind(".//sitemap:loc", NAMESPACE)
+    ]
+
+
+def test_sitemap_index_splits_posts_into_sections(
+        settings, many_posts_with_published_locations, client
+):
+    settings.SITEMAP_SECTION_SIZE = 5
+    last_id = max(post.id for post in many_posts_with_published_locations)
+    sections = get_locations(get_xml(client, "/sitemap.xml"))
+    assert [
+        section for section in sections if "posts" in section
+    ] == [
+        f"/sitemap-posts-{number}.xml"
+        for number in range(1, -(-last_id // 5) + 1)
+    ], "Убедитесь, что посты разбиты в карте сайта на разделы по id."
+    assert "/sitemap-categories-1.xml" in sections
+    assert "/sitemap-profiles-1.xml" in sections
+
+
+def test_sitemap_sections_list_visible_pages(
+        settings, post_with_published_location, mixer, client
+):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Post", is_published=False, category=post.category,
+        author=post.author,
+    )
+    posts = get_locations(get_xml(client, "/sitemap-posts-1.xml"))
+    assert f"/posts/{post.id}/" in posts
+    assert f"/posts/{hidden.id}/" not in posts, (
+        "Убедитесь, что в карту сайта не попадают скрытые посты."
+    )
+    categories = get_xml(client, "/sitemap-categories-1.xml")
+    assert get_locations(categories) == [
+        f"/category/{post.category.slug}/"
+    ]
+    assert categories.find(".//sitemap:lastmod", NAMESPACE).text == (
+        post.pub_date.date().isoformat()
+    )
+    assert get_locations(get_xml(client, "/sitemap-profiles-1.xml")) == [
+        f"/profile/{post.author.username}/"
+    ]
+    assert client.get("/sitemap-posts-2.xml").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_sitemap_section_is_streamed_then_cached(
+        post_with_published_location, client
+):
+    post = post_with_published_location
+    response = client.get("/sitemap-posts-1.xml")
+    assert response.streaming, (
+        "Убедитесь, что раздел карты сайта отдаётся потоком."
+    )
+    content = b"".join(response.streaming_content)
+    with CaptureQueriesContext(connection) as queries:
+        cached = client.get("/sitemap-posts-1.xml")
+    assert cached.content == content
+    assert len(queries) <= 1, (
+        "Убедитесь, что готовый раздел карты сайта берётся из кэша."
+    )
+    post.title = "Новый заголовок"
+    post.save()
+    assert client.get("/sitemap-posts-1.xml").streaming, (
+        "Убедитесь, что после изменения поста раздел карты сайта "
+        "формируется заново."
+    )
+
+
+async def asgi_get(path):
+    """Fetch a page through ASGIHandler, which streams in the event loop."""
+    communicator = ApplicationCommunicator(ASGIHandler(), {
+        "type": "http", "method": "GET", "path": path, "query_string": b"",
+        "headers": [(b"host", b"testserver")],
+    })
+    await communicator.send_input({"type": "http.request"})
+    start = await communicator.receive_output()
+    body = b""
+    while True:
+        message = await communicator.receive_output()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return start["status"], body
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sitemap_streamed_under_asgi(post_with_published_location):
+    post = post_with_published_location
+    for url in ("/sitemap.xml", "/sitemap-posts-1.xml"):
+        status, body = asyncio.run(asgi_get(url))
+        assert status == HTTPStatus.OK
+        assert ElementTree.fromstring(body).find(
+            ".//sitemap:loc", NAMESPACE
+        ) is not None, (
+            f"Убедитесь, что карта сайта `{url}` целиком отдаётся под ASGI."
+        )
+    assert f"/posts/{post.id}/".encode() in body
+
+
+def test_sitemap_sections_cached_separately(
+        settings, many_posts_with_published_locations, client
+):
+    settings.SITEMAP_SECTION_SIZE = 5
+    first, *_, last = sorted(
+        many_posts_with_published_locations, key=lambda post: post.id
+    )
+    assert last.id > 5
+    get_xml(client, "/sitemap-posts-1.xml")
+    last.title = "Новый заголовок"
+    last.save()
+    assert not client.get("/sitemap-posts-1.xml").streaming, (
+        "Убедитесь, что изменение поста не сбрасывает кэш разделов "
+        "карты сайта с другими постами."
+    )
@@ -0,0 +1,159 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test.client import Client
+from django.urls import reverse
+from django.utils import timezone
+
+WRITERS = 4
+READERS = 4
+REQUESTS = 10
+
+
+def run_and_close(function, *args):
+    try:
+        return function(*args)
+    finally:
+        connection.close()
+
+
+def in_thread(function, *args):
+    with ThreadPoolExecutor(1) as executor:
+        return executor.submit(run_and_close, function, *args).result()
+
+
+@pytest.fixture
+def sqlite_file(tmp_path, django_db_setup, django_db_blocker):
+    """Point connections opened by other threads to an SQLite file.
+
+    The in-memory test database has neither WAL nor file locks, so the
+    stress test runs against a freshly migrated file instead. The
+    connection of the main thread stays on the test database.
+    """
+    settings_dict = connection.settings_dict
+    name = settings_dict["NAME"]
+    with django_db_blocker.unblock():
+        connection.ensure_connection()
+        settings_dict["NAME"] = str(tmp_path / "db.sqlite3")
+        try:
+            in_thread(call_command, "migrate", "--verbosity=0")
+            yield
+        finally:
+            settings_dict["NAME"] = name
+
+
+def create_post():
+    from blog.models import Category, Post
+
+    author = get_user_model().objects.create_user("author", password="x")
+    return author, Post.objects.create(
+        title="Публикация",
+        text="Текст",
+        pub_date=timezone.now() - timedelta(days=1),
+        author=author,
+        category=Category.objects.create(
+            title="Категория", description="Описание", slug="category"
+        ),
+    )
+
+
+def get_pragmas():
+    with connection.cursor() as cursor:
+        pragmas = {}
+        for pragma in ("journal_mode", "busy_timeout", "temp_store"):
+            cursor.execute(f"PRAGMA {pragma}")
+            pragmas[pragma] = cursor.fetchone()[0]
+        return pragmas
+
+
+def test_sqlite_pragmas_applied(sqlite_file):
+    assert in_thread(get_pragmas) == {
+        "journal_mode": "wal",
+        "busy_timeout": 5000,
+        "temp_store": 2,
+    }, (
+        "Убедитесь, что при подключении к SQLite включаются WAL, "
+        "busy_timeout и temp_store=MEMORY."
+    )
+
+
+def post_comments(author, post_id):
+    client = Client()
+    client.force_login(author)
+    url = reverse("blog:add_comment", args=[post_id])
+    errors = 0
+    for number in range(REQUESTS):
+        try:
+            response = client.post(url, {"text": f"Комментарий {number}"})
+        except OperationalError as error:
+            if "locked" not in str(error):
+                raise
+            errors += 1
+        else:
+            assert response.status_code == HTTPStatus.FOUND
+    return errors
+
+
+def read_index():
+    client = Client()
+    errors = 0
+    for _ in range(REQUESTS):
+        try:
+            response = client.get(reverse("blog:index"))
+        except OperationalError as error:
+            if "locked" not in str(error):
+                raise
+            errors += 1
+        else:
+            assert response.status_code == HTTPStatus.OK
+    return errors
+
+
+def get_comment_count(post_id):
+    from blog.models import Comments, Post
+
+    return (
+        Comments.objects.filter(post_id=post_id).count(),
+        Post.objects.get(pk=post_id).comment_count,
+    )
+
+
+def test_concurrent_comments_do_not_lock(sqlite_file, capsys):
+    author, post = in_thread(create_post)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(WRITERS + READERS) as executor:
+        writers = [
+            executor.submit(run_and_close, post_comments, author, post.id)
+            for _ in range(WRITERS)
+        ]
+        readers = [
+            executor.submit(run_and_close, read_index)
+            for _ in range(READERS)
+        ]
+        write_errors = sum(future.result() for future in writers)
+        read_errors = sum(future.result() for future in readers)
+    elapsed = time.perf_counter() - start
+
+    with capsys.disabled():
+        total = (WRITERS + READERS) * REQUESTS
+        print(
+            f"\n{WRITERS} пишущих и {READERS} читающих потоков: "
+            f"{total / elapsed:.1f} запросов/с, блокировок при записи "
+            f"{write_errors}, при чтении {read_errors}"
+        )
+    assert (write_errors, read_errors) == (0, 0), (
+        "Убедитесь, что одновременная запись комментариев и чтение ленты "
+        "в SQLite не приводят к ошибке `database is locked`."
+    )
+    assert in_thread(get_comment_count, post.id) == (
+        WRITERS * REQUESTS, WRITERS * REQUESTS
+    ), (
+        "Убедитесь, что при одновременной записи сохраняются все "
+        "комментарии и счётчик комментариев публикации."
+    )